@@ -52,6 +52,10 @@ in {
 
           # Scraper
           httpx
+          h2
+          brotli
+          zstandard
+          orjson
           lxml
         ]));
 
@@ -1,26 +1,39 @@
 """Xueqiu API endpoint wrappers."""
 
-import json
+import asyncio
+import heapq
 import random
-import time
+from collections.abc import Collection
+from operator import attrgetter
 
 import httpx
+import orjson
 from loguru import logger
+from pydantic import TypeAdapter
 
 MAX_RETRIES = 5
 RETRY_BASE_DELAY = 30.0
-RETRY_JITTER = 0.5  # ±50% randomisation on retry delays
+RETRY_MAX_DELAY = 180.0  # cap for a single retry sleep
+RETRY_JITTER = 0.5  # ±50% randomisation on comment page delays
+COMMENT_CONCURRENCY = 5  # max in-flight comment page requests per article
 
+from scraper.cache import ResponseCache
 from scraper.models import (
     ArticleListResponse,
     ArticleSummary,
     Comment,
-    CommentsResponse,
 )
 
+# Validates only the comments that survive the author filter.
+_COMMENT_LIST_ADAPTER = TypeAdapter(list[Comment])
 
-def fetch_article_list(
-    client: httpx.Client,
+# Sleep used for pacing and retry backoff; tests patch this module-level
+# reference instead of the process-wide ``asyncio.sleep``.
+_sleep = asyncio.sleep
+
+
+async def fetch_article_list(
+    client: httpx.AsyncClient,
     user_id: int,
     page: int = 1,
     count: int = 10,
@@ -28,7 +41,7 @@ def fetch_article_list(
     """Fetch a page of original articles for a user.
 
     Args:
-        client: Configured httpx client.
+        client: Configured async httpx client.
         user_id: Xueqiu user ID.
         page: Page number (1-indexed).
         count: Articles per page.
@@ -36,18 +49,19 @@ def fetch_article_list(
     Returns:
         Parsed article list response.
     """
-    data = _request_with_retry(
+    body = await _request_bytes_with_retry(
         client,
         "GET",
         "/statuses/original/timeline.json",
         params={"user_id": user_id, "page": page, "count": count},
     )
-    return ArticleListResponse.model_validate(data)
+    return ArticleListResponse.model_validate_json(body)
 
 
-def fetch_article_detail(
-    client: httpx.Client,
+async def fetch_article_detail(
+    client: httpx.AsyncClient,
     article_id: int,
+    cache: ResponseCache | None = None,
 ) -> dict:
     """Fetch the full article detail via JSON API.
 
@@ -55,85 +69,116 @@ def fetch_article_detail(
     in the ``text`` field as HTML.
 
     Args:
-        client: Configured httpx client.
+        client: Configured async httpx client.
         article_id: Article/status ID.
+        cache: Optional response cache; a hit skips the request entirely.
 
     Returns:
         Raw JSON dict containing article fields including ``text``.
     """
-    return _request_with_retry(
-        client,
-        "GET",
-        "/statuses/show.json",
-        params={"id": article_id},
-    )
+    url = "/statuses/show.json"
+    params = {"id": article_id}
+    key = ResponseCache.make_key(url, params)
 
+    body = cache.get(key) if cache else None
+    if body is None:
+        body = await _request_bytes_with_retry(client, "GET", url, params=params)
+        if cache:
+            cache.set(key, body)
+    return _parse_json(body)
 
-def fetch_comments(
-    client: httpx.Client,
-    article_id: int,
-    page: int = 1,
-    count: int = 20,
-) -> CommentsResponse:
-    """Fetch comments on an article.
 
-    Args:
-        client: Configured httpx client.
-        article_id: Article/status ID.
-        page: Page number (1-indexed).
-        count: Comments per page.
+async def _fetch_comments_page(
+    client: httpx.AsyncClient,
+    article_id: int,
+    page: int,
+    count: int,
+) -> dict:
+    """Fetch one comments page as an unvalidated dict.
 
-    Returns:
-        Parsed comments response.
+    Comment pages are never cached. They are requested newest-first
+    (``asc=false``), so every new comment shifts all later comments one
+    slot down and changes every page, not just the first.
     """
-    data = _request_with_retry(
+    body = await _request_bytes_with_retry(
         client,
         "GET",
         "/statuses/comments.json",
         params={"id": article_id, "count": count, "page": page, "asc": "false"},
     )
-    return CommentsResponse.model_validate(data)
+    return _parse_json(body)
 
 
-def fetch_all_author_comments(
-    client: httpx.Client,
+async def fetch_all_author_comments(
+    client: httpx.AsyncClient,
     article_id: int,
-    author_id: int,
+    author_ids: Collection[int],
     count: int = 20,
     request_delay: float = 3.0,
+    concurrency: int = COMMENT_CONCURRENCY,
 ) -> list[Comment]:
     """Fetch all comments by the article author (补充说明).
 
-    Paginates through all comment pages and filters for comments
-    where ``comment.user.id == author_id``.
+    Fetches the first page to learn ``maxPage``, then requests the
+    remaining pages concurrently (at most *concurrency* in flight).
+    Comments are filtered on the raw JSON (``user.id in author_ids``)
+    before validation, so non-author replies are never turned into
+    models.
 
     Args:
-        client: Configured httpx client.
+        client: Configured async httpx client.
         article_id: Article/status ID.
-        author_id: User ID of the article author.
+        author_ids: User IDs whose comments count as author notes;
+            pass ``[author_id]`` for a single author.
         count: Comments per page.
-        request_delay: Delay between paginated requests in seconds.
+        request_delay: Delay before each follow-up page request in seconds
+            (randomised by ±50%).
+        concurrency: Maximum number of follow-up pages fetched at once.
 
     Returns:
         List of author comments sorted by creation time ascending.
     """
+    first = await _fetch_comments_page(client, article_id, 1, count)
+    pages = [first]
+    max_page = first.get("maxPage", 1)
+
+    if first.get("comments") and max_page > 1:
+        semaphore = asyncio.BoundedSemaphore(concurrency)
+
+        async def fetch_page(page: int) -> dict:
+            async with semaphore:
+                await _sleep(
+                    request_delay * random.uniform(1 - RETRY_JITTER, 1 + RETRY_JITTER)
+                )
+                return await _fetch_comments_page(client, article_id, page, count)
+
+        pages += await asyncio.gather(
+            *(fetch_page(page) for page in range(2, max_page + 1))
+        )
+
+    # Each page is a descending run (asc=false); reversed, the runs can be
+    # merged instead of re-sorted.
+    authors = frozenset(author_ids)
+    page_runs = [
+        _COMMENT_LIST_ADAPTER.validate_python(
+            [
+                raw
+                for raw in data.get("comments") or ()
+                if (raw.get("user") or {}).get("id") in authors
+            ][::-1]
+        )
+        for data in pages
+    ]
+
+    # Skip repeats: a comment posted mid-fetch shifts older ones a page
+    # down, so one can appear on two consecutive pages.
+    seen: set[int] = set()
     author_comments: list[Comment] = []
-    page = 1
-
-    while True:
-        resp = fetch_comments(client, article_id, page=page, count=count)
-
-        for comment in resp.comments:
-            if comment.user and comment.user.id == author_id:
-                author_comments.append(comment)
+    for comment in heapq.merge(*page_runs, key=attrgetter("created_at")):
+        if comment.id not in seen:
+            seen.add(comment.id)
+            author_comments.append(comment)
 
-        if page >= resp.maxPage or not resp.comments:
-            break
-        page += 1
-        time.sleep(request_delay)
-
-    # Sort by creation time ascending
-    author_comments.sort(key=lambda c: c.created_at)
     logger.debug(
         "Article {} has {} author comments",
         article_id,
@@ -142,72 +187,72 @@ def fetch_all_author_comments(
     return author_comments
 
 
-def _request_with_retry(
-    client: httpx.Client,
+async def _request_bytes_with_retry(
+    client: httpx.AsyncClient,
     method: str,
     url: str,
     **kwargs: object,
-) -> dict:
+) -> bytes:
     """Make an API request with retry on WAF rate-limit responses.
 
     When Xueqiu's Aliyun WAF triggers due to too many requests, it
     returns HTML instead of JSON. This function retries with
-    exponential backoff.
+    "decorrelated jitter" backoff: each sleep is drawn from
+    ``[RETRY_BASE_DELAY, 3 * previous sleep]`` and capped at
+    ``RETRY_MAX_DELAY``, so concurrent workers do not retry in lockstep
+    when the WAF lifts. A ``Retry-After`` header sets a lower bound.
+
+    The body is returned undecoded so callers can hand it straight to
+    ``Model.model_validate_json`` without building an intermediate dict.
 
     Args:
-        client: Configured httpx client.
+        client: Configured async httpx client.
         method: HTTP method (``GET``, ``POST``, etc.).
         url: Request URL or path.
         **kwargs: Extra arguments forwarded to ``client.request``.
 
     Returns:
-        Parsed JSON dict.
+        Raw JSON response body.
 
     Raises:
         RuntimeError: If all retries are exhausted.
     """
+    delay = RETRY_BASE_DELAY
     for attempt in range(1, MAX_RETRIES + 1):
-        resp = client.request(method, url, **kwargs)
-        resp.raise_for_status()
-
-        content_type = resp.headers.get("content-type", "")
-
-        # Successful JSON response
-        if "json" in content_type:
-            try:
-                return resp.json()
-            except json.JSONDecodeError as exc:
-                snippet = resp.text[:200]
-                logger.error("Failed to parse JSON: {} body={}", exc, snippet)
-                raise RuntimeError(
-                    f"API returned non-JSON response (status {resp.status_code})."
-                ) from exc
-
-        # WAF / rate-limit: got HTML instead of JSON
-        if attempt < MAX_RETRIES:
-            # Honour Retry-After header when present
+        async with client.stream(method, url, **kwargs) as resp:
+            resp.raise_for_status()
+
+            content_type = resp.headers.get("content-type", "")
+
+            # Successful JSON response
+            if "json" in content_type:
+                return await resp.aread()
+
+            # WAF / rate-limit: got HTML instead of JSON. The interstitial
+            # page is discarded unread; only the final attempt peeks at it
+            # for the error log.
             retry_after = resp.headers.get("Retry-After")
+            if attempt == MAX_RETRIES:
+                snippet = await _peek_text(resp)
+
+        if attempt < MAX_RETRIES:
+            delay = min(RETRY_MAX_DELAY, random.uniform(RETRY_BASE_DELAY, delay * 3))
+
+            # Honour Retry-After header as a floor when present
             if retry_after:
                 try:
-                    base_delay = float(retry_after)
+                    delay = max(delay, float(retry_after))
                 except ValueError:
-                    base_delay = RETRY_BASE_DELAY * attempt
-            else:
-                base_delay = RETRY_BASE_DELAY * attempt
+                    pass
 
-            # Add random jitter to avoid predictable retry patterns
-            delay = base_delay * random.uniform(
-                1 - RETRY_JITTER, 1 + RETRY_JITTER
-            )
             logger.warning(
                 "WAF rate-limit hit (attempt {}/{}), retrying in {:.0f}s...",
                 attempt,
                 MAX_RETRIES,
                 delay,
             )
-            time.sleep(delay)
+            await _sleep(delay)
         else:
-            snippet = resp.text[:200]
             logger.error("API returned HTML after {} retries: {}", MAX_RETRIES, snippet)
             raise RuntimeError(
                 "API returned HTML instead of JSON after retries. "
@@ -216,18 +261,75 @@ def _request_with_retry(
             )
 
 
-def check_auth(client: httpx.Client, user_id: int) -> bool:
-    """Verify the cookie is valid by making a small API request.
+async def _peek_text(resp: httpx.Response, size: int = 200) -> str:
+    """Read only the first *size* bytes of a streamed body, for logging."""
+    async for chunk in resp.aiter_bytes(chunk_size=size):
+        return chunk[:size].decode("utf-8", errors="replace")
+    return ""
+
+
+def _parse_json(body: bytes) -> dict:
+    """Decode a raw JSON response body into a dict.
+
+    Raises:
+        RuntimeError: If the body is not valid JSON.
+    """
+    try:
+        return orjson.loads(body)
+    except orjson.JSONDecodeError as exc:
+        logger.error("Failed to parse JSON: {} body={}", exc, body[:200])
+        raise RuntimeError("API returned a malformed JSON response.") from exc
+
+
+async def check_auth(client: httpx.AsyncClient, user_id: int) -> bool:
+    """Verify the cookie is valid with a minimal API request.
+
+    Streams a one-item timeline request and closes it as soon as the
+    status and content type are known — the body is never downloaded
+    or parsed. A WAF block (HTML response) counts as a failure and is
+    not retried; use :func:`check_auth_deep` for a full fetch.
+
+    Args:
+        client: Configured async httpx client.
+        user_id: Xueqiu user ID.
+
+    Returns:
+        True if the API answers 200 with JSON, False otherwise.
+    """
+    try:
+        async with client.stream(
+            "GET",
+            "/statuses/original/timeline.json",
+            params={"user_id": user_id, "page": 1, "count": 1},
+        ) as resp:
+            status = resp.status_code
+            content_type = resp.headers.get("content-type", "")
+    except httpx.RequestError as exc:
+        logger.error("Auth check request error: {}", exc)
+        return False
+
+    if status == 200 and "json" in content_type:
+        return True
+
+    logger.error("Auth check failed: HTTP {} ({})", status, content_type)
+    return False
+
+
+async def check_auth_deep(client: httpx.AsyncClient, user_id: int) -> bool:
+    """Verify the cookie by fetching and parsing an article list page.
+
+    Slower than :func:`check_auth` (downloads and validates the page and
+    retries through WAF blocks) but also confirms the user has articles.
 
     Args:
-        client: Configured httpx client.
+        client: Configured async httpx client.
         user_id: Xueqiu user ID.
 
     Returns:
         True if the request succeeds, False otherwise.
     """
     try:
-        resp = fetch_article_list(client, user_id, page=1, count=1)
+        resp = await fetch_article_list(client, user_id, page=1, count=1)
         return resp.total > 0
     except httpx.HTTPStatusError as exc:
         logger.error("Auth check failed: {}", exc)
@@ -235,6 +337,6 @@ def check_auth(client: httpx.Client, user_id: int) -> bool:
     except httpx.RequestError as exc:
         logger.error("Auth check request error: {}", exc)
         return False
-    except RuntimeError as exc:
+    except (RuntimeError, ValueError) as exc:
         logger.error("Auth check failed: {}", exc)
         return False
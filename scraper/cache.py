@@ -0,0 +1,82 @@
+"""Persistent on-disk cache for raw Xueqiu API responses."""
+
+import sqlite3
+import time
+from pathlib import Path
+
+from loguru import logger
+
+# File name of the cache database inside the data directory.
+CACHE_FILENAME = ".http_cache.sqlite3"
+
+# Entries older than this are ignored and refetched, and purged when the
+# cache is opened. Kept below the daily sync interval so a scheduled run
+# never reuses the previous day's pages.
+DEFAULT_TTL = 12 * 3600.0
+
+
+class ResponseCache:
+    """SQLite-backed store of raw API response bodies keyed by path and params.
+
+    Lets a re-run after a WAF ban (or a post-processing tweak) skip
+    requests that already succeeded. Only responses that do not change
+    between runs should be stored — callers decide what is cacheable.
+
+    Args:
+        path: SQLite database file. Parent directories are created.
+        ttl: Maximum age of a usable entry in seconds.
+    """
+
+    def __init__(self, path: Path, ttl: float = DEFAULT_TTL) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self._conn = sqlite3.connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, body BLOB NOT NULL, stored_at REAL NOT NULL)"
+        )
+        # Drop expired rows so the file does not keep every body ever seen
+        self._conn.execute(
+            "DELETE FROM responses WHERE stored_at < ?", (time.time() - ttl,)
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(url: str, params: dict) -> str:
+        """Build a stable cache key from a request path and query params."""
+        query = "&".join(f"{k}={v}" for k, v in sorted(params.items()))
+        return f"{url}?{query}"
+
+    def get(self, key: str) -> bytes | None:
+        """Return the cached body for *key*, or None if missing or stale."""
+        row = self._conn.execute(
+            "SELECT body, stored_at FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        body, stored_at = row
+        if time.time() - stored_at > self.ttl:
+            return None
+
+        logger.debug("Cache hit: {}", key)
+        return body
+
+    def set(self, key: str, body: bytes) -> None:
+        """Store a raw response *body* under *key*, replacing any previous entry."""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO responses (key, body, stored_at) "
+            "VALUES (?, ?, ?)",
+            (key, body, time.time()),
+        )
+        self._conn.commit()
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self._conn.close()
+
+    def __enter__(self) -> "ResponseCache":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
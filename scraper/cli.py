@@ -1,13 +1,19 @@
-"""CLI interface for the Xueqiu article scraper."""
+"""CLI interface for the Xueqiu article scraper.
+
+Network and storage modules (``httpx``, ``lxml``, ``loguru``, ...) are
+imported inside the commands that need them, so lightweight commands
+like ``status`` do not pay for them at startup.
+"""
+
+from contextlib import AbstractContextManager, nullcontext
+from typing import TYPE_CHECKING
 
 import click
-from loguru import logger
 
-from scraper.api import check_auth
-from scraper.client import create_client
-from scraper.config import load_config
-from scraper.crawler import backfill_comments, sync_articles
-from scraper.storage import load_manifest
+from scraper.config import ScraperConfig, load_config
+
+if TYPE_CHECKING:
+    from scraper.cache import ResponseCache
 
 
 @click.group()
@@ -15,6 +21,17 @@ def main() -> None:
     """Xueqiu article scraper - download and sync original articles."""
 
 
+def _open_cache(
+    cfg: ScraperConfig,
+) -> "AbstractContextManager[ResponseCache | None]":
+    """Open the on-disk response cache, or a no-op context if disabled."""
+    from scraper.cache import CACHE_FILENAME, ResponseCache
+
+    if not cfg.use_cache:
+        return nullcontext()
+    return ResponseCache(cfg.data_dir / CACHE_FILENAME)
+
+
 @main.command()
 @click.option(
     "--cookie",
@@ -40,15 +57,33 @@ def main() -> None:
     default=False,
     help="Skip fetching author comments (can backfill later).",
 )
+@click.option(
+    "--full-scan",
+    is_flag=True,
+    default=False,
+    help="List every page instead of stopping at already-synced articles.",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    default=False,
+    help="Ignore cached API responses and always hit the network.",
+)
 def sync(
     cookie: str | None,
     config_path: str | None,
     max_pages: int,
     skip_comments: bool,
+    full_scan: bool,
+    no_cache: bool,
 ) -> None:
     """Download all new articles (incremental sync)."""
+    import asyncio
     from pathlib import Path
 
+    from scraper.client import create_client
+    from scraper.crawler import sync_articles
+
     cfg = load_config(
         config_path=Path(config_path) if config_path else None,
         cookie=cookie,
@@ -66,8 +101,18 @@ def sync(
     if skip_comments:
         cfg.skip_comments = True
 
-    with create_client(cfg.cookie) as client:
-        count = sync_articles(client, cfg)
+    if full_scan:
+        cfg.full_scan = True
+
+    if no_cache:
+        cfg.use_cache = False
+
+    async def run() -> int:
+        async with create_client(cfg.cookie, max_rps=cfg.max_rps) as client:
+            with _open_cache(cfg) as cache:
+                return await sync_articles(client, cfg, cache)
+
+    count = asyncio.run(run())
 
     if count:
         click.echo(f"Downloaded {count} new article(s).")
@@ -88,10 +133,21 @@ def sync(
     default=None,
     help="Path to YAML config file.",
 )
-def check_auth_cmd(cookie: str | None, config_path: str | None) -> None:
+@click.option(
+    "--deep",
+    is_flag=True,
+    default=False,
+    help="Fetch and parse an article page (with WAF retries) instead of "
+    "only checking the response status.",
+)
+def check_auth_cmd(cookie: str | None, config_path: str | None, deep: bool) -> None:
     """Check if the cookie is still valid."""
+    import asyncio
     from pathlib import Path
 
+    from scraper.api import check_auth, check_auth_deep
+    from scraper.client import create_client
+
     cfg = load_config(
         config_path=Path(config_path) if config_path else None,
         cookie=cookie,
@@ -100,8 +156,12 @@ def check_auth_cmd(cookie: str | None, config_path: str | None) -> None:
     if not cfg.cookie:
         raise click.UsageError("Cookie is required.")
 
-    with create_client(cfg.cookie) as client:
-        ok = check_auth(client, cfg.user_id)
+    async def run() -> bool:
+        async with create_client(cfg.cookie) as client:
+            check = check_auth_deep if deep else check_auth
+            return await check(client, cfg.user_id)
+
+    ok = asyncio.run(run())
 
     if ok:
         click.echo("Authentication is valid.")
@@ -125,8 +185,13 @@ def check_auth_cmd(cookie: str | None, config_path: str | None) -> None:
 )
 def backfill_comments_cmd(cookie: str | None, config_path: str | None) -> None:
     """Re-fetch author comments for articles where the initial fetch failed."""
+    import asyncio
     from pathlib import Path
 
+    from scraper.client import create_client
+    from scraper.crawler import backfill_comments
+    from scraper.storage import load_manifest
+
     cfg = load_config(
         config_path=Path(config_path) if config_path else None,
         cookie=cookie,
@@ -147,8 +212,11 @@ def backfill_comments_cmd(cookie: str | None, config_path: str | None) -> None:
 
     click.echo(f"{pending} article(s) need comment backfill.")
 
-    with create_client(cfg.cookie) as client:
-        count = backfill_comments(client, cfg)
+    async def run() -> int:
+        async with create_client(cfg.cookie, max_rps=cfg.max_rps) as client:
+            return await backfill_comments(client, cfg)
+
+    count = asyncio.run(run())
 
     click.echo(f"Backfilled comments for {count} article(s).")
 
@@ -165,6 +233,8 @@ def status(config_path: str | None) -> None:
     """Show sync status and statistics."""
     from pathlib import Path
 
+    from scraper.storage import load_manifest
+
     cfg = load_config(config_path=Path(config_path) if config_path else None)
     manifest = load_manifest(cfg.data_dir)
 
@@ -1,14 +1,34 @@
 """HTTP client factory for Xueqiu API requests."""
 
 import random
+import re
 
 import httpx
 from loguru import logger
 
+from scraper.ratelimit import TokenBucket
+
 BASE_URL = "https://api.xueqiu.com"
 
+# Keep idle connections alive across request_delay sleeps and retry
+# backoff so one TLS session is reused for the whole sync (httpx's
+# default 5s expiry is shorter than a typical inter-request delay).
+POOL_LIMITS = httpx.Limits(
+    max_connections=10,
+    max_keepalive_connections=10,
+    keepalive_expiry=75.0,
+)
+
+# Transport-level retries for failed connection attempts (DNS, TCP, TLS).
+# Only requests that never reached the server are retried, so this is
+# safe for every endpoint; HTTP errors and WAF pages are handled in api.
+CONNECT_RETRIES = 2
+
+# Requests a rate-limited client may send back to back after being idle.
+RATE_LIMIT_BURST = 2.0
+
 # Pool of realistic User-Agent strings for rotation.
-_USER_AGENTS = [
+_USER_AGENTS = (
     (
         "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
         "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
@@ -31,7 +51,17 @@ _USER_AGENTS = [
         "AppleWebKit/605.1.15 (KHTML, like Gecko) "
         "Version/17.5 Safari/605.1.15"
     ),
-]
+)
+
+# Private RNG for UA selection, independent of the global random state.
+_UA_RNG = random.Random()
+
+# One ``name=value`` segment of a Cookie header, anchored at the start of
+# the string or a ``;``. Like splitting on ``;`` and partitioning on the
+# first ``=``: names may contain spaces or be empty, values may contain
+# ``=``, surrounding whitespace is dropped and segments without ``=`` are
+# skipped. The lookahead leaves the next ``;`` for the next match.
+_COOKIE_RE = re.compile(r"(?:^|;)\s*([^=;]*?)\s*=\s*([^;]*?)\s*(?=;|$)")
 
 # Browser-like headers to avoid being blocked.
 DEFAULT_HEADERS = {
@@ -42,9 +72,56 @@ DEFAULT_HEADERS = {
 }
 
 
-def _rotate_user_agent(request: httpx.Request) -> None:
+async def _rotate_user_agent(request: httpx.Request) -> None:
     """Event hook that sets a random User-Agent before each request."""
-    request.headers["User-Agent"] = random.choice(_USER_AGENTS)
+    request.headers["User-Agent"] = _UA_RNG.choice(_USER_AGENTS)
+
+
+async def _log_protocol(response: httpx.Response) -> None:
+    """Event hook that logs the negotiated HTTP version of each response."""
+    logger.debug(
+        "{} {} -> {} over {}",
+        response.request.method,
+        response.request.url.path,
+        response.status_code,
+        response.http_version,
+    )
+
+
+class RateLimitedTransport(httpx.AsyncBaseTransport):
+    """Transport wrapper that sends every request through a token bucket.
+
+    Caps the request rate of the whole client, however many tasks share
+    it, and turns a ``Retry-After`` response header into a pause for all
+    of them rather than only the task that received it. That task also
+    sleeps off the header as its retry floor; the bucket debt is repaid
+    during that sleep, so its next request is not held back again.
+
+    Args:
+        transport: Transport that performs the requests.
+        bucket: Token bucket shared by all requests of the client.
+    """
+
+    def __init__(
+        self, transport: httpx.AsyncBaseTransport, bucket: TokenBucket
+    ) -> None:
+        self._transport = transport
+        self._bucket = bucket
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await self._bucket.acquire()
+        response = await self._transport.handle_async_request(request)
+
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                self._bucket.penalize(float(retry_after))
+            except ValueError:
+                pass
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
 
 
 def _parse_cookie_string(cookie_str: str) -> dict[str, str]:
@@ -64,20 +141,19 @@ def _parse_cookie_string(cookie_str: str) -> dict[str, str]:
 
     # If it contains '=' it's a full cookie header string
     if "=" in cookie_str:
-        cookies: dict[str, str] = {}
-        for pair in cookie_str.split(";"):
-            pair = pair.strip()
-            if "=" in pair:
-                key, _, value = pair.partition("=")
-                cookies[key.strip()] = value.strip()
-        return cookies
+        return dict(_COOKIE_RE.findall(cookie_str))
 
     # Otherwise treat as a bare xq_a_token value
     return {"xq_a_token": cookie_str}
 
 
-def create_client(cookie: str, timeout: float = 30.0) -> httpx.Client:
-    """Create an httpx client configured for Xueqiu.
+def create_client(
+    cookie: str,
+    timeout: float = 30.0,
+    rotate_user_agent: bool = True,
+    max_rps: float | None = None,
+) -> httpx.AsyncClient:
+    """Create an async httpx client configured for Xueqiu.
 
     Accepts either a full browser Cookie header string (recommended,
     includes WAF cookies) or a bare ``xq_a_token`` value.
@@ -85,22 +161,58 @@ def create_client(cookie: str, timeout: float = 30.0) -> httpx.Client:
     To get the full cookie string: open browser DevTools → Network tab →
     click any request to xueqiu.com → copy the ``Cookie`` header value.
 
+    HTTP/2 is enabled so concurrent requests are multiplexed over a
+    single TLS connection (requires the ``h2`` package). httpx
+    advertises and decodes ``br`` / ``zstd`` in addition to gzip when
+    the ``brotli`` / ``zstandard`` packages are installed, so
+    ``Accept-Encoding`` is deliberately not overridden here.
+
     Args:
         cookie: Full cookie header string or bare xq_a_token value.
-        timeout: Request timeout in seconds.
+        timeout: Read timeout in seconds. Connect and write timeouts are
+            fixed at 10s, pool acquisition at 5s.
+        rotate_user_agent: Pick a new User-Agent for every request. When
+            False, one User-Agent is pinned for the client's lifetime,
+            which looks more like a single real browser session.
+        max_rps: Cap on requests per second across everything sharing the
+            client (bursts of up to ``RATE_LIMIT_BURST``). None disables it.
 
     Returns:
-        A configured httpx.Client instance. Caller is responsible for
-        closing it (use as context manager).
+        A configured httpx.AsyncClient instance. Caller is responsible for
+        closing it (use as async context manager).
     """
     cookies = _parse_cookie_string(cookie)
     logger.debug("Using cookies: {}", list(cookies.keys()))
 
-    return httpx.Client(
+    headers = dict(DEFAULT_HEADERS)
+    request_hooks = []
+    if rotate_user_agent:
+        request_hooks.append(_rotate_user_agent)
+    else:
+        headers["User-Agent"] = _UA_RNG.choice(_USER_AGENTS)
+
+    # With an explicit transport, pool limits and HTTP/2 must be set on
+    # the transport; the client-level arguments would be ignored.
+    transport = httpx.AsyncHTTPTransport(
+        http2=True,
+        limits=POOL_LIMITS,
+        retries=CONNECT_RETRIES,
+    )
+    if max_rps is not None:
+        transport = RateLimitedTransport(
+            transport, TokenBucket(max_rps, capacity=RATE_LIMIT_BURST)
+        )
+
+    return httpx.AsyncClient(
         base_url=BASE_URL,
-        headers=DEFAULT_HEADERS,
+        headers=headers,
         cookies=cookies,
-        timeout=timeout,
+        timeout=httpx.Timeout(connect=10.0, read=timeout, write=10.0, pool=5.0),
+        transport=transport,
         follow_redirects=True,
-        event_hooks={"request": [_rotate_user_agent]},
+        event_hooks={
+            "request": request_hooks,
+            "response": [_log_protocol],
+        },
     )
+
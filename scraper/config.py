@@ -1,24 +1,33 @@
 """Scraper configuration loaded from YAML file and/or environment variables."""
 
+import dataclasses
 import os
 from pathlib import Path
 
-import yaml
-from pydantic import BaseModel, Field
+from pydantic import ConfigDict, Field
+from pydantic.dataclasses import dataclass
 
 
 DEFAULT_CONFIG_PATH = Path("config.yaml")
+ENV_PREFIX = "XUEQIU_"
 DEFAULT_DATA_DIR = Path("data/articles")
 DEFAULT_USER_ID = 2426670165
 DEFAULT_REQUEST_DELAY = 3.0
 DEFAULT_PAGE_SIZE = 10
+DEFAULT_CONCURRENCY = 4
+DEFAULT_MAX_RPS = 1.0
 
 
-class ScraperConfig(BaseModel):
+@dataclass(slots=True, config=ConfigDict(extra="ignore"))
+class ScraperConfig:
     """Configuration for the Xueqiu scraper.
 
     Values are loaded from a YAML file and can be overridden by
     environment variables or CLI arguments.
+
+    A slotted pydantic dataclass rather than a ``BaseModel``: the input is
+    still validated and coerced, but instances carry no per-instance
+    model bookkeeping. Unknown keys are ignored.
     """
 
     user_id: int = DEFAULT_USER_ID
@@ -26,6 +35,16 @@ class ScraperConfig(BaseModel):
     data_dir: Path = DEFAULT_DATA_DIR
     request_delay: float = DEFAULT_REQUEST_DELAY
     page_size: int = DEFAULT_PAGE_SIZE
+    concurrency: int = Field(
+        default=DEFAULT_CONCURRENCY,
+        ge=1,
+        description="Maximum number of articles downloaded at once.",
+    )
+    max_rps: float = Field(
+        default=DEFAULT_MAX_RPS,
+        gt=0,
+        description="Maximum API requests per second across all concurrent tasks.",
+    )
     max_pages: int = Field(
         default=0,
         description="Maximum pages to fetch. 0 means all pages.",
@@ -34,6 +53,14 @@ class ScraperConfig(BaseModel):
         default=False,
         description="Skip fetching author comments during sync.",
     )
+    full_scan: bool = Field(
+        default=False,
+        description="List every page instead of stopping at synced articles.",
+    )
+    use_cache: bool = Field(
+        default=True,
+        description="Reuse cached article details and converted Markdown on disk.",
+    )
 
 
 def load_config(
@@ -42,6 +69,11 @@ def load_config(
 ) -> ScraperConfig:
     """Load configuration from YAML file, env vars, and explicit overrides.
 
+    Every config field can be overridden by an ``XUEQIU_<FIELD>``
+    environment variable (e.g. ``XUEQIU_USER_ID``, ``XUEQIU_REQUEST_DELAY``);
+    values are coerced to the field type by pydantic. Empty variables
+    are ignored.
+
     Args:
         config_path: Path to YAML config file. Falls back to ``config.yaml``
             in the current directory if it exists.
@@ -55,23 +87,23 @@ def load_config(
     # 1. Load from YAML file
     path = config_path or DEFAULT_CONFIG_PATH
     if path.exists():
+        import yaml
+
+        # Use the libyaml-backed loader when PyYAML was built with it.
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
         with open(path) as f:
-            yaml_data = yaml.safe_load(f)
+            yaml_data = yaml.load(f, Loader=loader)
         if isinstance(yaml_data, dict):
             values.update(yaml_data)
 
     # 2. Override with environment variables
-    env_cookie = os.environ.get("XUEQIU_COOKIE")
-    if env_cookie:
-        values["cookie"] = env_cookie
-
-    env_user_id = os.environ.get("XUEQIU_USER_ID")
-    if env_user_id:
-        values["user_id"] = int(env_user_id)
-
-    env_data_dir = os.environ.get("XUEQIU_DATA_DIR")
-    if env_data_dir:
-        values["data_dir"] = env_data_dir
+    fields = {f.name for f in dataclasses.fields(ScraperConfig)}
+    for key, value in os.environ.items():
+        if not value or not key.startswith(ENV_PREFIX):
+            continue
+        name = key[len(ENV_PREFIX) :].lower()
+        if name in fields:
+            values[name] = value
 
     # 3. Override with explicit arguments
     if cookie:
@@ -1,28 +1,69 @@
 """HTML content extraction and HTML-to-Markdown conversion for Xueqiu articles."""
 
-import json
+import functools
+import hashlib
+import io
 import re
 import html as html_lib
+import threading
+from typing import NamedTuple
 
+import orjson
 from lxml import etree
 from loguru import logger
 
+# Class token of the main article content container (``div``).
+ARTICLE_CLASS = "article__bd__detail"
 
-# XPath for the main article content container.
-ARTICLE_XPATH = '//div[contains(@class, "article__bd__detail")]'
+# Shared, lenient HTML parser options. Comments and processing
+# instructions are dropped at parse time so later traversal never sees
+# them.
+_PARSER_OPTIONS = {
+    "encoding": "utf-8",
+    "recover": True,
+    "remove_comments": True,
+    "remove_pis": True,
+}
 
-# Regex to find the embedded JSON data in <script> tags.
-SCRIPT_JSON_RE = re.compile(
-    r'SNB\.data\.current_status\s*=\s*(\{.*?\})\s*;',
-    re.DOTALL,
-)
+# Reused parser for article bodies, one per thread: an lxml parser keeps
+# state between parses and must not be shared across threads.
+_PARSERS = threading.local()
+
+# Version of html_to_markdown's output. Part of the crawler's Markdown
+# memo key; bump it whenever the conversion changes so cached output from
+# an older converter is not reused.
+MARKDOWN_VERSION = 1
+
+# Bytes fed to the pull parser per step while searching a page.
+PARSE_CHUNK_SIZE = 64 * 1024
+
+# Tag groups dispatched on by the walker. lxml's HTML parser already
+# yields lowercase tag names, so membership tests need no normalisation.
+_HEADING_TAGS = frozenset({"h1", "h2", "h3", "h4", "h5", "h6"})
+_LIST_TAGS = frozenset({"ul", "ol"})
+_BOLD_TAGS = frozenset({"strong", "b"})
+_ITALIC_TAGS = frozenset({"em", "i"})
+
+# Last-resort tag stripper for markup lxml cannot parse at all.
+_TAG_RE = re.compile(r"<[^>]+>")
+
+# JavaScript assignment that carries the embedded article JSON.
+SCRIPT_JSON_MARKER = "SNB.data.current_status"
+
+# The ``=`` (with surrounding whitespace) following the marker.
+_ASSIGN_RE = re.compile(r"\s*=\s*")
+
+# Tokens that matter when finding the end of a JSON object: whole string
+# literals (so braces inside them are skipped) and braces.
+_JSON_TOKEN_RE = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|[{}]', re.DOTALL)
 
 
 def extract_article_html(page_html: str) -> str:
     """Extract article body HTML from a full Xueqiu article page.
 
     Tries two strategies:
-    1. XPath on the rendered HTML for the article detail div.
+    1. Pull-parse the rendered HTML up to the end of the article
+       detail div.
     2. Fallback: parse embedded JSON in ``<script>`` tags (Xueqiu uses
        client-side rendering so the content is often in JS data).
 
@@ -32,10 +73,12 @@ def extract_article_html(page_html: str) -> str:
     Returns:
         Article body HTML, or empty string if extraction fails.
     """
-    # Strategy 1: XPath on rendered HTML
-    content = _extract_via_xpath(page_html)
-    if content:
-        return content
+    # Strategy 1: DOM of the rendered HTML
+    element = _extract_via_dom(page_html)
+    if element is not None:
+        return etree.tostring(
+            element, encoding="unicode", method="html", with_tail=False
+        )
 
     # Strategy 2: Embedded JSON in script tags
     content = _extract_via_script_json(page_html)
@@ -46,38 +89,112 @@ def extract_article_html(page_html: str) -> str:
     return ""
 
 
-def _extract_via_xpath(page_html: str) -> str:
-    """Extract article HTML using XPath."""
-    try:
-        tree = etree.HTML(page_html)
-        if tree is None:
-            return ""
+def _extract_via_dom(page_html: str) -> etree._Element | None:
+    """Extract article HTML by pull-parsing the page.
 
-        nodes = tree.xpath(ARTICLE_XPATH)
-        if not nodes:
-            return ""
+    The page is fed to the parser in chunks and parsing stops as soon as
+    the first article div closes, so the rest of the page (comments,
+    sidebars, scripts) is never parsed. Elements that close before the
+    article starts are cleared to keep the partial tree small.
+    """
+    parser = etree.HTMLPullParser(events=("start", "end"), **_PARSER_OPTIONS)
+    data = page_html.encode("utf-8")
+    article: etree._Element | None = None
 
-        # Serialize the first match back to HTML string
-        return etree.tostring(nodes[0], encoding="unicode", method="html")
+    try:
+        for offset in range(0, len(data), PARSE_CHUNK_SIZE):
+            parser.feed(data[offset : offset + PARSE_CHUNK_SIZE])
+            for event, element in parser.read_events():
+                if article is None:
+                    if event == "start" and _is_article_div(element):
+                        article = element
+                    elif event == "end":
+                        element.clear(keep_tail=True)
+                elif event == "end" and element is article:
+                    return article
+        parser.close()
     except etree.Error:
-        logger.debug("XPath extraction failed")
-        return ""
+        logger.debug("DOM extraction failed")
+        return None
+
+    # Unclosed article div: keep what was parsed (None if never found)
+    return article
+
+
+def _is_article_div(element: etree._Element) -> bool:
+    """Return True if *element* is the article content container."""
+    return element.tag == "div" and ARTICLE_CLASS in element.get("class", "").split()
 
 
 def _extract_via_script_json(page_html: str) -> str:
     """Extract article content from embedded JSON in script tags."""
-    match = SCRIPT_JSON_RE.search(page_html)
-    if not match:
+    # The marker also occurs outside the assignment (in conditions, as a
+    # prefix of other names), so skip occurrences not followed by "= {".
+    idx = page_html.find(SCRIPT_JSON_MARKER)
+    while idx >= 0:
+        after = idx + len(SCRIPT_JSON_MARKER)
+        assign = _ASSIGN_RE.match(page_html, after)
+        if assign is not None and page_html.startswith("{", assign.end()):
+            break
+        idx = page_html.find(SCRIPT_JSON_MARKER, after)
+    else:
+        return ""
+
+    start = assign.end()
+    end = _find_object_end(page_html, start)
+    if end < 0:
+        logger.debug("Script JSON extraction failed: unbalanced object")
         return ""
 
     try:
-        data = json.loads(match.group(1))
-        # The content field contains the article HTML
-        return data.get("text", "") or data.get("description", "")
-    except (json.JSONDecodeError, KeyError):
+        data = orjson.loads(page_html[start:end])
+    except orjson.JSONDecodeError:
         logger.debug("Script JSON extraction failed")
         return ""
 
+    if not isinstance(data, dict):
+        return ""
+    # The content field contains the article HTML; "description" is only
+    # looked up when "text" is missing or empty
+    return data.get("text") or data.get("description") or ""
+
+
+def _find_object_end(text: str, start: int) -> int:
+    """Return the index just past the JSON object starting at *start*.
+
+    Braces are counted while string literals are skipped whole, so the
+    scan is linear and never backtracks. Returns -1 if *text* has no
+    ``{`` at *start* or the object is never closed.
+    """
+    if not text.startswith("{", start):
+        return -1
+
+    depth = 0
+    for token in _JSON_TOKEN_RE.finditer(text, start):
+        brace = token.group()
+        if brace == "{":
+            depth += 1
+        elif brace == "}":
+            depth -= 1
+            if depth == 0:
+                return token.end()
+    return -1
+
+
+def content_hash(html_content: str) -> str:
+    """Return a short hex digest identifying an article body.
+
+    BLAKE2b with a 16-byte digest: faster than SHA-256 in hashlib and
+    plenty to tell article revisions apart.
+
+    Args:
+        html_content: Article body HTML.
+
+    Returns:
+        32-character hex digest.
+    """
+    return hashlib.blake2b(html_content.encode("utf-8"), digest_size=16).hexdigest()
+
 
 def html_to_markdown(html_content: str) -> str:
     """Convert article HTML to Markdown.
@@ -95,95 +212,186 @@ def html_to_markdown(html_content: str) -> str:
         return ""
 
     try:
-        tree = etree.HTML(f"<div>{html_content}</div>")
+        root = _parse_fragment(html_content)
     except etree.Error:
         # Fallback: strip all tags
         return _strip_tags(html_content)
 
-    if tree is None:
+    if root is None:
         return _strip_tags(html_content)
 
-    lines: list[str] = []
-    body = tree.xpath("//div")[0] if tree.xpath("//div") else tree
-
-    _walk_node(body, lines)
-
-    text = "\n".join(lines)
-    # Clean up excessive blank lines
-    text = re.sub(r"\n{3,}", "\n\n", text)
-    return text.strip()
-
-
-def _walk_node(node: etree._Element, lines: list[str]) -> None:
-    """Recursively walk an HTML element tree, appending Markdown lines."""
-    tag = _local_tag(node.tag) if isinstance(node.tag, str) else ""
-
-    # Handle block-level elements
-    if tag in ("h1", "h2", "h3", "h4", "h5", "h6"):
-        level = int(tag[1])
-        text = _get_all_text(node).strip()
-        if text:
-            lines.append("")
-            lines.append(f"{'#' * level} {text}")
-            lines.append("")
-        return
-
-    if tag == "p":
-        text = _inline_to_markdown(node).strip()
-        if text:
-            lines.append("")
-            lines.append(text)
-            lines.append("")
-        return
-
-    if tag == "br":
-        lines.append("")
-        return
-
-    if tag == "blockquote":
-        inner_lines: list[str] = []
-        for child in node:
-            _walk_node(child, inner_lines)
-        text = _get_all_text(node).strip() if not inner_lines else "\n".join(inner_lines)
-        for line in text.split("\n"):
-            lines.append(f"> {line}")
-        lines.append("")
-        return
-
-    if tag in ("ul", "ol"):
-        lines.append("")
-        for i, li in enumerate(node):
-            if _local_tag(li.tag) == "li":
-                text = _get_all_text(li).strip()
-                prefix = f"{i + 1}." if tag == "ol" else "-"
-                lines.append(f"{prefix} {text}")
-        lines.append("")
-        return
-
-    if tag == "img":
-        src = node.get("src", "")
-        alt = node.get("alt", "")
-        if src:
-            # Fix protocol-relative URLs
-            if src.startswith("//"):
-                src = f"https:{src}"
-            lines.append(f"![{alt}]({src})")
-        return
-
-    if tag == "hr":
-        lines.append("")
-        lines.append("---")
-        lines.append("")
-        return
-
-    # For other tags (div, span, etc.), recurse into children
-    if node.text:
-        lines.append(node.text)
+    out = _MarkdownWriter()
+    _walk_node(root, out)
+    return out.getvalue().strip()
 
-    for child in node:
-        _walk_node(child, lines)
-        if child.tail:
-            lines.append(child.tail)
+
+class _MarkdownWriter:
+    """Line-oriented Markdown output buffer.
+
+    Lines are written straight into an ``io.StringIO`` separated by
+    newlines. Runs of more than one blank line are suppressed as they
+    are written, so the result never needs a post-hoc cleanup pass.
+    """
+
+    def __init__(self) -> None:
+        self._buf = io.StringIO()
+        self._started = False
+        # Consecutive newlines at the end of the buffer.
+        self._newlines = 0
+        self.empty = True
+
+    def line(self, text: str = "") -> None:
+        """Start a new line containing *text* (empty for a blank line)."""
+        if self._started:
+            self._newline()
+        self._started = True
+        self.empty = False
+        self._write(text)
+
+    def getvalue(self) -> str:
+        """Return everything written so far."""
+        return self._buf.getvalue()
+
+    def _write(self, text: str) -> None:
+        # Embedded newlines (text nodes, <br> in paragraphs) go through the
+        # same blank-line suppression as line breaks between lines.
+        if "\n" not in text:
+            if text:
+                self._buf.write(text)
+                self._newlines = 0
+            return
+
+        for i, segment in enumerate(text.split("\n")):
+            if i:
+                self._newline()
+            if segment:
+                self._buf.write(segment)
+                self._newlines = 0
+
+    def _newline(self) -> None:
+        if self._newlines < 2:
+            self._buf.write("\n")
+            self._newlines += 1
+
+
+class _QuoteEnd(NamedTuple):
+    """Walker stack marker: the children of *node* (a blockquote) are done."""
+
+    node: etree._Element
+
+
+def _walk_node(root: etree._Element, out: _MarkdownWriter) -> None:
+    """Walk an HTML element tree, writing Markdown lines.
+
+    Iterative rather than recursive: an explicit stack holds elements
+    still to visit, tail strings to write, and :class:`_QuoteEnd`
+    markers, so deeply nested articles never hit the recursion limit.
+    Blockquote bodies are collected in their own writer, kept on a
+    writer stack until the matching marker is popped.
+    """
+    writers = [out]
+    stack: list[etree._Element | str | _QuoteEnd] = [root]
+
+    while stack:
+        item = stack.pop()
+
+        if isinstance(item, str):
+            writers[-1].line(item)
+            continue
+
+        if isinstance(item, _QuoteEnd):
+            inner = writers.pop()
+            if inner.empty:
+                text = _get_all_text(item.node).strip()
+            else:
+                text = inner.getvalue()
+            for line in text.split("\n"):
+                writers[-1].line(f"> {line}")
+            writers[-1].line()
+            continue
+
+        node = item
+        w = writers[-1]
+        tag = _tag_name(node)
+
+        # Handle block-level elements
+        if tag in _HEADING_TAGS:
+            level = int(tag[1])
+            text = _get_all_text(node).strip()
+            if text:
+                w.line()
+                w.line(f"{'#' * level} {text}")
+                w.line()
+
+        elif tag == "p":
+            text = _inline_to_markdown(node).strip()
+            if text:
+                w.line()
+                w.line(text)
+                w.line()
+
+        elif tag == "br":
+            w.line()
+
+        elif tag == "blockquote":
+            # Children (without their tails) go into a nested writer
+            writers.append(_MarkdownWriter())
+            stack.append(_QuoteEnd(node))
+            stack.extend(reversed(node))
+
+        elif tag in _LIST_TAGS:
+            w.line()
+            for i, li in enumerate(node):
+                if _tag_name(li) == "li":
+                    text = _get_all_text(li).strip()
+                    prefix = f"{i + 1}." if tag == "ol" else "-"
+                    w.line(f"{prefix} {text}")
+            w.line()
+
+        elif tag == "img":
+            src = node.get("src", "")
+            alt = node.get("alt", "")
+            if src:
+                # Fix protocol-relative URLs
+                if src.startswith("//"):
+                    src = f"https:{src}"
+                w.line(f"![{alt}]({src})")
+
+        elif tag == "hr":
+            w.line()
+            w.line("---")
+            w.line()
+
+        else:
+            # For other tags (div, span, etc.), visit children in order,
+            # each followed by its tail text
+            if node.text:
+                w.line(node.text)
+            for child in reversed(node):
+                if child.tail:
+                    stack.append(child.tail)
+                stack.append(child)
+
+
+def _parse_html(html_content: str) -> etree._Element | None:
+    """Parse an HTML string with this thread's reusable parser."""
+    return etree.fromstring(html_content.encode("utf-8"), _html_parser())
+
+
+def _html_parser() -> etree.HTMLParser:
+    """Return the calling thread's HTML parser, creating it on first use."""
+    parser = getattr(_PARSERS, "parser", None)
+    if parser is None:
+        parser = _PARSERS.parser = etree.HTMLParser(**_PARSER_OPTIONS)
+    return parser
+
+
+def _parse_fragment(html_content: str) -> etree._Element | None:
+    """Parse an HTML fragment and return the ``<div>`` wrapping it."""
+    tree = _parse_html(f"<div>{html_content}</div>")
+    if tree is None:
+        return None
+    return next(tree.iter("div"), tree)
 
 
 def _inline_to_markdown(node: etree._Element) -> str:
@@ -194,21 +402,11 @@ def _inline_to_markdown(node: etree._Element) -> str:
         parts.append(node.text)
 
     for child in node:
-        tag = _local_tag(child.tag) if isinstance(child.tag, str) else ""
-        inner = _get_all_text(child).strip()
-
-        if tag == "a":
-            href = child.get("href", "")
-            if href and inner:
-                parts.append(f"[{inner}]({href})")
-            elif inner:
-                parts.append(inner)
-        elif tag in ("strong", "b"):
-            if inner:
-                parts.append(f"**{inner}**")
-        elif tag in ("em", "i"):
-            if inner:
-                parts.append(f"*{inner}*")
+        tag = _tag_name(child)
+
+        # Tags that need no text are handled before extracting any
+        if tag == "br":
+            parts.append("\n")
         elif tag == "img":
             src = child.get("src", "")
             alt = child.get("alt", "")
@@ -216,13 +414,17 @@ def _inline_to_markdown(node: etree._Element) -> str:
                 if src.startswith("//"):
                     src = f"https:{src}"
                 parts.append(f"![{alt}]({src})")
-        elif tag == "br":
-            parts.append("\n")
-        elif tag == "code":
-            if inner:
+        elif inner := "".join(child.itertext()).strip():
+            if tag == "a":
+                href = child.get("href", "")
+                parts.append(f"[{inner}]({href})" if href else inner)
+            elif tag in _BOLD_TAGS:
+                parts.append(f"**{inner}**")
+            elif tag in _ITALIC_TAGS:
+                parts.append(f"*{inner}*")
+            elif tag == "code":
                 parts.append(f"`{inner}`")
-        else:
-            if inner:
+            else:
                 parts.append(inner)
 
         if child.tail:
@@ -233,17 +435,40 @@ def _inline_to_markdown(node: etree._Element) -> str:
 
 def _get_all_text(node: etree._Element) -> str:
     """Get all text content from an element (including children)."""
-    return etree.tostring(node, encoding="unicode", method="text") or ""
+    return "".join(node.itertext())
 
 
+def _tag_name(node: etree._Element) -> str:
+    """Return the local tag name of *node*, or "" for non-element nodes."""
+    tag = node.tag
+    return _local_tag(tag) if isinstance(tag, str) else ""
+
+
+@functools.lru_cache(maxsize=256)
 def _local_tag(tag: str) -> str:
-    """Strip namespace prefix from tag name if present."""
+    """Strip namespace prefix from tag name if present.
+
+    Cached: an article only uses a couple of dozen distinct tag names.
+    """
     if "}" in tag:
         return tag.split("}", 1)[1]
     return tag.lower()
 
 
 def _strip_tags(html_content: str) -> str:
-    """Fallback: strip HTML tags and decode entities."""
-    text = re.sub(r"<[^>]+>", "", html_content)
+    """Fallback: reduce HTML to its plain text content.
+
+    Tries lxml's text extraction first (entities are decoded by the
+    parser) and only falls back to a regex strip plus
+    ``html.unescape`` if the markup cannot be parsed.
+    """
+    try:
+        root = _parse_fragment(html_content)
+    except etree.Error:
+        root = None
+
+    if root is not None:
+        return _get_all_text(root).strip()
+
+    text = _TAG_RE.sub("", html_content)
     return html_lib.unescape(text).strip()
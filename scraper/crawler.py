@@ -1,79 +1,48 @@
 """Orchestrate article scraping: list → fetch → extract → save."""
 
+import asyncio
 import random
-import time
+from concurrent.futures import Executor, ThreadPoolExecutor
 
 import httpx
 from loguru import logger
 
-# Take a longer break every BATCH_PAUSE_EVERY articles to look less robotic.
-BATCH_PAUSE_EVERY = 5
-BATCH_PAUSE_RANGE = (30.0, 60.0)
-
-
-class AdaptiveDelay:
-    """Self-adjusting delay with random jitter.
-
-    On success the delay slowly decreases back toward *min_delay*;
-    on failure (WAF hit, HTTP error) it doubles up to *max_delay*.
-    Each call to :meth:`wait` adds ±50 % jitter so consecutive
-    requests are never equally spaced.
-
-    Args:
-        base: Starting delay in seconds.
-        min_delay: Lower bound in seconds.
-        max_delay: Upper bound in seconds.
-        jitter: Fractional jitter range (0.5 → ±50 %).
-    """
-
-    def __init__(
-        self,
-        base: float,
-        min_delay: float = 3.0,
-        max_delay: float = 120.0,
-        jitter: float = 0.5,
-    ) -> None:
-        self.current = base
-        self.min_delay = min_delay
-        self.max_delay = max_delay
-        self.jitter = jitter
-
-    def success(self) -> None:
-        """Decrease delay after a successful request."""
-        self.current = max(self.min_delay, self.current * 0.9)
-
-    def failure(self) -> None:
-        """Increase delay after a failed / rate-limited request."""
-        self.current = min(self.max_delay, self.current * 2)
-
-    def wait(self) -> None:
-        """Sleep for the current delay with random jitter."""
-        delay = self.current * random.uniform(
-            1 - self.jitter, 1 + self.jitter
-        )
-        time.sleep(delay)
-
 from scraper.api import (
     fetch_all_author_comments,
     fetch_article_detail,
     fetch_article_list,
 )
+from scraper.cache import ResponseCache
 from scraper.config import ScraperConfig
-from scraper.content import html_to_markdown
+from scraper.content import MARKDOWN_VERSION, content_hash, html_to_markdown
 from scraper.models import (
     ArticleFull,
     ArticleSummary,
+    Comment,
     SyncManifestEntry,
 )
+from scraper.ratelimit import AdaptiveDelay
 from scraper.storage import (
     append_comments_to_article,
+    append_manifest_delta,
+    format_timestamp,
     load_manifest,
     save_article,
     save_manifest,
 )
 
+__all__ = ["sync_articles", "backfill_comments"]
 
-def sync_articles(client: httpx.Client, config: ScraperConfig) -> int:
+# Take a longer break every BATCH_PAUSE_EVERY articles to look less robotic.
+BATCH_PAUSE_EVERY = 5
+BATCH_PAUSE_RANGE = (30.0, 60.0)
+
+
+async def sync_articles(
+    client: httpx.AsyncClient,
+    config: ScraperConfig,
+    cache: ResponseCache | None = None,
+) -> int:
     """Download all new articles for the configured user, one page at a time.
 
     Processes each page of the article list immediately: fetches the list page,
@@ -81,9 +50,19 @@ def sync_articles(client: httpx.Client, config: ScraperConfig) -> int:
     moving to the next page. This spreads requests evenly and allows resuming
     from any point.
 
+    Up to ``config.concurrency`` articles of a page are in flight at once.
+    Their start times are still spaced by the adaptive delay (and batch
+    pauses), so one article's downloads overlap the wait before the next.
+
+    The timeline is newest first, so once every page has been listed
+    (``manifest.history_complete``) the scan stops at the first page that
+    holds an article synced by an earlier run. ``config.full_scan`` forces
+    listing every page, e.g. to retry older articles that failed.
+
     Args:
-        client: Configured httpx client.
+        client: Configured async httpx client.
         config: Scraper configuration.
+        cache: Optional response cache for article details and comments.
 
     Returns:
         Number of newly downloaded articles.
@@ -91,66 +70,67 @@ def sync_articles(client: httpx.Client, config: ScraperConfig) -> int:
     manifest = load_manifest(config.data_dir)
     manifest.user_id = config.user_id
     downloaded = 0
+    started = 0
+    # Articles listed during this run; they never count as the synced tail.
+    listed_this_run: set[int] = set()
     page = 1
     # Detail endpoint has stricter WAF limits than the list endpoint,
     # so use a longer base delay before each article fetch.
     delay = AdaptiveDelay(base=config.request_delay * 3)
+    semaphore = asyncio.BoundedSemaphore(config.concurrency)
+    # Held only while waiting, so starts are paced but downloads overlap.
+    pacing = asyncio.Lock()
+    # Markdown conversion and article file writes run off the event loop so
+    # they overlap the next article's network wait. One worker is plenty (a
+    # conversion or write takes milliseconds, the paced downloads seconds)
+    # and keeps the writes serialized. Shut down by the ``with`` below.
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sync-io")
+
+    async def process(summary: ArticleSummary, index: int, total: int) -> bool:
+        nonlocal started
+        async with semaphore:
+            async with pacing:
+                # Batch pause: take a longer break every N articles
+                if started > 0 and started % BATCH_PAUSE_EVERY == 0:
+                    pause = random.uniform(*BATCH_PAUSE_RANGE)
+                    logger.info(
+                        "Batch pause after {} articles, sleeping {:.0f}s",
+                        started,
+                        pause,
+                    )
+                    await asyncio.sleep(pause)
+                started += 1
+                await delay.wait()
 
-    while True:
-        logger.debug("Fetching article list page {}", page)
-        resp = fetch_article_list(
-            client,
-            config.user_id,
-            page=page,
-            count=config.page_size,
-        )
-
-        new_on_page = [a for a in resp.articles if not manifest.has_article(a.id)]
-
-        if new_on_page:
-            logger.info(
-                "Page {}: {} new article(s) to download", page, len(new_on_page)
-            )
-
-        for i, summary in enumerate(new_on_page, 1):
-            # Batch pause: take a longer break every N articles
-            if downloaded > 0 and downloaded % BATCH_PAUSE_EVERY == 0:
-                pause = random.uniform(*BATCH_PAUSE_RANGE)
-                logger.info(
-                    "Batch pause after {} articles, sleeping {:.0f}s",
-                    downloaded,
-                    pause,
-                )
-                time.sleep(pause)
-
-            delay.wait()
             logger.info(
                 "[page {} {}/{}] Fetching: {} ({})",
                 page,
-                i,
-                len(new_on_page),
+                index,
+                total,
                 summary.title,
                 summary.id,
             )
 
             try:
-                full = _fetch_full_article(client, config, summary)
-                path = save_article(config.data_dir, full)
+                full = await _fetch_full_article(
+                    client, config, summary, cache, executor
+                )
+                # Written on the worker thread so disk latency overlaps the
+                # other in-flight downloads.
+                loop = asyncio.get_running_loop()
+                path = await loop.run_in_executor(
+                    executor, save_article, config.data_dir, full
+                )
 
                 manifest.add_article(
                     SyncManifestEntry(
                         article_id=full.id,
                         title=full.title,
                         file_path=str(path),
-                        synced_at=full.created_datetime.strftime(
-                            "%Y-%m-%dT%H:%M:%S+08:00"
-                        ),
+                        synced_at=format_timestamp(full.created_datetime),
                         comments_fetched=not full.comments_fetch_failed,
                     )
                 )
-                downloaded += 1
-                delay.success()
-
             except httpx.HTTPStatusError as exc:
                 logger.error(
                     "HTTP error fetching article {}: {}",
@@ -158,6 +138,7 @@ def sync_articles(client: httpx.Client, config: ScraperConfig) -> int:
                     exc,
                 )
                 delay.failure()
+                return False
             except Exception as exc:
                 logger.error(
                     "Failed to process article {}: {}",
@@ -165,68 +146,116 @@ def sync_articles(client: httpx.Client, config: ScraperConfig) -> int:
                     exc,
                 )
                 delay.failure()
+                return False
+
+            delay.success()
+            return True
+
+    with executor:
+        while True:
+            logger.debug("Fetching article list page {}", page)
+            resp = await fetch_article_list(
+                client,
+                config.user_id,
+                page=page,
+                count=config.page_size,
+            )
+
+            # Check the live int-keyed manifest rather than a snapshot set:
+            # articles saved on earlier pages must count as known if the
+            # listing shifts between page requests.
+            new_on_page = [a for a in resp.articles if not manifest.has_article(a.id)]
+            reached_synced = any(
+                a.id not in listed_this_run and manifest.has_article(a.id)
+                for a in resp.articles
+            )
+            listed_this_run.update(a.id for a in resp.articles)
+
+            if new_on_page:
+                logger.info(
+                    "Page {}: {} new article(s) to download", page, len(new_on_page)
+                )
+
+            results = await asyncio.gather(
+                *(
+                    process(summary, i, len(new_on_page))
+                    for i, summary in enumerate(new_on_page, 1)
+                )
+            )
+            downloaded += sum(results)
+
+            if page >= resp.maxPage or not resp.articles:
+                manifest.history_complete = True
+                save_manifest(config.data_dir, manifest)
+                break
 
-        # Save manifest after each page to preserve progress
-        save_manifest(config.data_dir, manifest)
+            # Save manifest after each page to preserve progress
+            save_manifest(config.data_dir, manifest)
 
-        if page >= resp.maxPage or not resp.articles:
-            break
+            if reached_synced and manifest.history_complete and not config.full_scan:
+                logger.info("Page {}: reached already-synced articles", page)
+                break
 
-        if config.max_pages and page >= config.max_pages:
-            logger.info("Reached max_pages limit ({})", config.max_pages)
-            break
+            if config.max_pages and page >= config.max_pages:
+                logger.info("Reached max_pages limit ({})", config.max_pages)
+                break
 
-        page += 1
+            page += 1
 
     logger.info("Downloaded {} new articles", downloaded)
     return downloaded
 
 
-def _fetch_full_article(
-    client: httpx.Client,
+async def _fetch_full_article(
+    client: httpx.AsyncClient,
     config: ScraperConfig,
     summary: ArticleSummary,
+    cache: ResponseCache | None = None,
+    executor: Executor | None = None,
 ) -> ArticleFull:
     """Fetch the full content and author comments for an article.
 
+    The author comments are fetched concurrently with the article detail
+    rather than after it.
+
     Args:
-        client: Configured httpx client.
+        client: Configured async httpx client.
         config: Scraper configuration.
         summary: Article summary from the list API.
+        cache: Optional response cache for article details and comments.
+        executor: Optional executor for the HTML-to-Markdown conversion;
+            converts inline on the event loop when omitted.
 
     Returns:
         ArticleFull with extracted content and author comments.
     """
     user_id = summary.user_id or (summary.user.id if summary.user else config.user_id)
 
-    # Fetch article detail via JSON API
-    detail = fetch_article_detail(client, summary.id)
-    time.sleep(config.request_delay)
-
-    # The API returns article HTML in the "text" field
-    content_html = detail.get("text", "")
-    content_md = html_to_markdown(content_html)
-
-    # Fetch author's supplementary notes (non-fatal if it fails)
+    # Fetch author's supplementary notes in the background
     if config.skip_comments:
-        author_comments = []
-        comments_failed = True
+        comments_task = None
     else:
-        try:
-            author_comments = fetch_all_author_comments(
-                client,
-                summary.id,
-                user_id,
-                request_delay=config.request_delay,
-            )
-        except Exception as exc:
-            logger.warning(
-                "Failed to fetch comments for article {}: {}", summary.id, exc
-            )
-            author_comments = []
-            comments_failed = True
-        else:
-            comments_failed = False
+        comments_task = asyncio.create_task(
+            _fetch_author_comments(client, config, summary.id, user_id)
+        )
+
+    # Don't leave the comment fetch running if the detail fetch or the
+    # conversion fails.
+    try:
+        # Fetch article detail via JSON API
+        detail = await fetch_article_detail(client, summary.id, cache=cache)
+
+        # The API returns article HTML in the "text" field
+        content_html = detail.get("text", "")
+        html_hash = content_hash(content_html)
+        content_md = await _convert_markdown(content_html, html_hash, cache, executor)
+    except BaseException:
+        if comments_task:
+            comments_task.cancel()
+        raise
+
+    author_comments = await comments_task if comments_task else None
+    comments_failed = author_comments is None
 
     return ArticleFull(
         id=summary.id,
@@ -239,20 +268,74 @@ def _fetch_full_article(
         like_count=detail.get("fav_count", summary.like_count),
         reply_count=detail.get("reply_count", summary.reply_count),
         retweet_count=detail.get("retweet_count", summary.retweet_count),
-        author_comments=author_comments,
+        author_comments=author_comments or [],
         comments_fetch_failed=comments_failed,
     )
 
 
-def backfill_comments(client: httpx.Client, config: ScraperConfig) -> int:
+async def _convert_markdown(
+    content_html: str,
+    html_hash: str,
+    cache: ResponseCache | None,
+    executor: Executor | None,
+) -> str:
+    """Convert article HTML to Markdown, reusing a cached conversion.
+
+    The result is stored in the response cache under the converter
+    version and content hash, so a resumed run that gets the same
+    article body (typically from the cached detail response) skips the
+    conversion.
+    """
+    key = f"markdown:v{MARKDOWN_VERSION}:{html_hash}"
+    if cache is not None and (cached := cache.get(key)) is not None:
+        return cached.decode("utf-8")
+
+    if executor is None:
+        content_md = html_to_markdown(content_html)
+    else:
+        loop = asyncio.get_running_loop()
+        content_md = await loop.run_in_executor(
+            executor, html_to_markdown, content_html
+        )
+
+    if cache is not None:
+        cache.set(key, content_md.encode("utf-8"))
+    return content_md
+
+
+async def _fetch_author_comments(
+    client: httpx.AsyncClient,
+    config: ScraperConfig,
+    article_id: int,
+    user_id: int,
+) -> list[Comment] | None:
+    """Fetch author comments, returning None instead of raising on failure."""
+    try:
+        return await fetch_all_author_comments(
+            client,
+            article_id,
+            [user_id],
+            request_delay=config.request_delay,
+        )
+    except Exception as exc:
+        logger.warning("Failed to fetch comments for article {}: {}", article_id, exc)
+        return None
+
+
+async def backfill_comments(
+    client: httpx.AsyncClient,
+    config: ScraperConfig,
+) -> int:
     """Re-fetch author comments for articles where the initial fetch failed.
 
     Iterates through manifest entries with ``comments_fetched=False``,
     fetches the comments, appends them to the existing Markdown file,
-    and updates the manifest.
+    and journals the manifest update (the full manifest is rewritten
+    every few articles and at the end). Like :func:`sync_articles`, up to
+    ``config.concurrency`` articles are in flight with paced starts.
 
     Args:
-        client: Configured httpx client.
+        client: Configured async httpx client.
         config: Scraper configuration.
 
     Returns:
@@ -272,68 +355,87 @@ def backfill_comments(client: httpx.Client, config: ScraperConfig) -> int:
         return 0
 
     logger.info("{} article(s) need comment backfill", len(pending))
-    backfilled = 0
+    started = 0
+    unsaved = 0
     delay = AdaptiveDelay(base=config.request_delay * 3)
+    semaphore = asyncio.BoundedSemaphore(config.concurrency)
+    # Held only while waiting, so starts are paced but downloads overlap.
+    pacing = asyncio.Lock()
+
+    async def process(article_id: int, entry: SyncManifestEntry) -> bool:
+        nonlocal started, unsaved
+        async with semaphore:
+            async with pacing:
+                # Batch pause
+                if started > 0 and started % BATCH_PAUSE_EVERY == 0:
+                    pause = random.uniform(*BATCH_PAUSE_RANGE)
+                    logger.info(
+                        "Batch pause after {} articles, sleeping {:.0f}s",
+                        started,
+                        pause,
+                    )
+                    await asyncio.sleep(pause)
+                started += 1
+                await delay.wait()
 
-    for article_id_str, entry in pending.items():
-        # Batch pause
-        if backfilled > 0 and backfilled % BATCH_PAUSE_EVERY == 0:
-            pause = random.uniform(*BATCH_PAUSE_RANGE)
-            logger.info(
-                "Batch pause after {} articles, sleeping {:.0f}s",
-                backfilled,
-                pause,
-            )
-            time.sleep(pause)
-
-        delay.wait()
-        article_id = int(article_id_str)
-        user_id = manifest.user_id
+            user_id = manifest.user_id
 
-        logger.info(
-            "Backfilling comments for: {} ({})", entry.title, article_id
-        )
+            logger.info("Backfilling comments for: {} ({})", entry.title, article_id)
 
-        try:
-            comments = fetch_all_author_comments(
-                client,
-                article_id,
-                user_id,
-                request_delay=config.request_delay,
-            )
-        except httpx.HTTPStatusError as exc:
-            if exc.response.status_code == 405:
-                logger.warning(
-                    "Article {} got 405 Not Allowed — API may be temporarily "
-                    "blocking requests. Try again later with: "
-                    "python -m scraper.cli backfill-comments",
+            try:
+                comments = await fetch_all_author_comments(
+                    client,
                     article_id,
+                    [user_id],
+                    request_delay=config.request_delay,
                 )
-            else:
+            except httpx.HTTPStatusError as exc:
+                if exc.response.status_code == 405:
+                    logger.warning(
+                        "Article {} got 405 Not Allowed — API may be temporarily "
+                        "blocking requests. Try again later with: "
+                        "python -m scraper.cli backfill-comments",
+                        article_id,
+                    )
+                else:
+                    logger.error(
+                        "Failed to fetch comments for article {}: {}",
+                        article_id,
+                        exc,
+                    )
+                delay.failure()
+                return False
+            except Exception as exc:
                 logger.error(
                     "Failed to fetch comments for article {}: {}",
                     article_id,
                     exc,
                 )
-            delay.failure()
-            continue
-        except Exception as exc:
-            logger.error(
-                "Failed to fetch comments for article {}: {}",
-                article_id,
-                exc,
-            )
-            delay.failure()
-            continue
-
-        file_path = Path(entry.file_path)
-        if comments:
-            append_comments_to_article(file_path, comments)
-
-        entry.comments_fetched = True
-        save_manifest(config.data_dir, manifest)
-        backfilled += 1
-        delay.success()
+                delay.failure()
+                return False
+
+            file_path = Path(entry.file_path)
+            if comments:
+                append_comments_to_article(file_path, comments)
+
+            entry.comments_fetched = True
+            # Journal each update; rewrite the full manifest only now and then
+            append_manifest_delta(config.data_dir, entry)
+            unsaved += 1
+            if unsaved >= BATCH_PAUSE_EVERY:
+                save_manifest(config.data_dir, manifest)
+                unsaved = 0
+            delay.success()
+            return True
+
+    try:
+        results = await asyncio.gather(
+            *(process(aid, entry) for aid, entry in pending.items())
+        )
+    finally:
+        if unsaved:
+            save_manifest(config.data_dir, manifest)
+    backfilled = sum(results)
 
     logger.info("Backfilled comments for {} article(s)", backfilled)
     return backfilled
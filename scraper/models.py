@@ -137,17 +137,23 @@ class SyncManifestEntry(BaseModel):
 class SyncManifest(BaseModel):
     """Tracks downloaded articles for incremental sync.
 
-    Persisted as ``manifest.json`` in the data directory.
+    Persisted as ``manifest.json`` in the data directory. Articles are
+    keyed by integer ID in memory; JSON object keys are strings, which
+    pydantic converts in both directions, so the file format is unchanged.
     """
 
     user_id: int = 0
     last_sync: str = ""
-    articles: dict[str, SyncManifestEntry] = Field(default_factory=dict)
+    articles: dict[int, SyncManifestEntry] = Field(default_factory=dict)
+    history_complete: bool = Field(
+        default=False,
+        description="Whether a sync has listed every page of the timeline.",
+    )
 
     def has_article(self, article_id: int) -> bool:
         """Check whether an article has already been downloaded."""
-        return str(article_id) in self.articles
+        return article_id in self.articles
 
     def add_article(self, entry: SyncManifestEntry) -> None:
         """Register a newly downloaded article."""
-        self.articles[str(entry.article_id)] = entry
+        self.articles[entry.article_id] = entry
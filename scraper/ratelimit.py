@@ -0,0 +1,104 @@
+"""Request pacing helpers shared by the crawler and the HTTP client."""
+
+import asyncio
+import random
+import time
+from collections.abc import Awaitable, Callable
+
+
+class AdaptiveDelay:
+    """Self-adjusting delay with random jitter.
+
+    On success the delay slowly decreases back toward *min_delay*;
+    on failure (WAF hit, HTTP error) it doubles up to *max_delay*.
+    Each call to :meth:`wait` adds ±50 % jitter so consecutive
+    requests are never equally spaced.
+
+    Args:
+        base: Starting delay in seconds.
+        min_delay: Lower bound in seconds.
+        max_delay: Upper bound in seconds.
+        jitter: Fractional jitter range (0.5 → ±50 %).
+    """
+
+    def __init__(
+        self,
+        base: float,
+        min_delay: float = 3.0,
+        max_delay: float = 120.0,
+        jitter: float = 0.5,
+    ) -> None:
+        self.current = base
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+
+    def success(self) -> None:
+        """Decrease delay after a successful request."""
+        self.current = max(self.min_delay, self.current * 0.9)
+
+    def failure(self) -> None:
+        """Increase delay after a failed / rate-limited request."""
+        self.current = min(self.max_delay, self.current * 2)
+
+    async def wait(self) -> None:
+        """Sleep for the current delay with random jitter."""
+        # Same distribution as random.uniform(1 - j, 1 + j), one RNG call.
+        factor = 1.0 - self.jitter + 2.0 * self.jitter * random.random()
+        await asyncio.sleep(self.current * factor)
+
+
+class TokenBucket:
+    """Token-bucket limiter shared by concurrent coroutines.
+
+    Tokens refill continuously at *rate* per second, up to *capacity*.
+    Each :meth:`acquire` takes one, sleeping until it is available.
+    Waiters are served in arrival order, so a burst from many tasks is
+    spread out to *rate* instead of hitting the server at once.
+
+    Args:
+        rate: Sustained requests per second.
+        capacity: Maximum burst size (tokens that can accumulate while idle).
+        clock: Monotonic clock in seconds.
+        sleep: Coroutine function that sleeps for a number of seconds.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[object]] = asyncio.sleep,
+    ) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = capacity
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """Wait for and take one token."""
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1.0:
+                await self._sleep((1.0 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1.0
+
+    def penalize(self, seconds: float) -> None:
+        """Hold back every waiter for at least *seconds* from now.
+
+        Used when the server asks to back off (``Retry-After``): the bucket
+        goes into debt, so no task sends until it has refilled.
+        """
+        self._refill()
+        self._tokens = min(self._tokens, 1.0 - seconds * self.rate)
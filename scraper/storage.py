@@ -1,14 +1,51 @@
 """Markdown file writing, manifest persistence, and filename utilities."""
 
-import json
+import html
+import io
+import os
 import re
 from datetime import datetime
 from pathlib import Path
 
+import orjson
 from loguru import logger
 
 from scraper.models import ArticleFull, Comment, SyncManifest, SyncManifestEntry
 
+# Manifest snapshot and its append-only journal of later entry updates.
+MANIFEST_FILENAME = "manifest.json"
+MANIFEST_JOURNAL_FILENAME = "manifest.jsonl"
+
+# Timestamps are naive Asia/Shanghai local times; the offset is appended.
+TIMESTAMP_OFFSET = "+08:00"
+
+# Filename sanitizing: unsafe characters, then runs of underscores.
+_UNSAFE_CHARS_RE = re.compile(r"[^\w\u4e00-\u9fff\-]")
+_UNDERSCORES_RE = re.compile(r"_+")
+
+# Inline markup in comment text.
+_BR_RE = re.compile(r"<br\s*/?>", re.IGNORECASE)
+_TAG_RE = re.compile(r"<[^>]+>")
+
+# Angle brackets decoded from entities are escaped again, so escaped
+# markup in a comment stays literal text in the Markdown file.
+_ANGLE_ESCAPES = str.maketrans({"<": "&lt;", ">": "&gt;"})
+
+
+def format_timestamp(dt: datetime) -> str:
+    """Format a naive local datetime as ISO 8601 with the +08:00 offset.
+
+    Equivalent to ``strftime("%Y-%m-%dT%H:%M:%S+08:00")`` but goes
+    through ``isoformat`` instead of the strftime/locale machinery.
+
+    Args:
+        dt: Naive datetime in Asia/Shanghai local time.
+
+    Returns:
+        Timestamp string such as ``2024-01-15T08:30:00+08:00``.
+    """
+    return dt.isoformat(timespec="seconds") + TIMESTAMP_OFFSET
+
 
 def sanitize_filename(name: str, max_length: int = 50) -> str:
     """Sanitize a string for safe use in filenames.
@@ -24,11 +61,11 @@ def sanitize_filename(name: str, max_length: int = 50) -> str:
         Filesystem-safe string.
     """
     # Remove characters that are not alphanumeric, CJK, hyphen, or underscore
-    safe = re.sub(r'[^\w\u4e00-\u9fff\-]', '_', name)
+    safe = _UNSAFE_CHARS_RE.sub("_", name)
     # Collapse multiple underscores
-    safe = re.sub(r'_+', '_', safe).strip('_')
+    safe = _UNDERSCORES_RE.sub("_", safe).strip("_")
     if len(safe) > max_length:
-        safe = safe[:max_length].rstrip('_')
+        safe = safe[:max_length].rstrip("_")
     return safe or "untitled"
 
 
@@ -45,9 +82,9 @@ def build_article_path(data_dir: Path, article: ArticleFull) -> Path:
         Path object for the Markdown file.
     """
     dt = article.created_datetime
-    year_dir = data_dir / dt.strftime("%Y")
+    year_dir = data_dir / f"{dt.year:04d}"
     safe_title = sanitize_filename(article.title)
-    filename = f"{dt.strftime('%Y-%m-%d')}_{safe_title}_{article.id}.md"
+    filename = f"{dt.date().isoformat()}_{safe_title}_{article.id}.md"
     return year_dir / filename
 
 
@@ -62,10 +99,17 @@ def save_article(data_dir: Path, article: ArticleFull) -> Path:
         Path to the written file.
     """
     path = build_article_path(data_dir, article)
-    path.parent.mkdir(parents=True, exist_ok=True)
 
-    content = _format_article(article)
-    path.write_text(content, encoding="utf-8")
+    # Encode once and write bytes: no text-layer buffering or newline
+    # translation for a file that is always UTF-8 with "\n" line endings.
+    data = _format_article(article).encode("utf-8")
+    try:
+        path.write_bytes(data)
+    except FileNotFoundError:
+        # First article of its year: create the directory only then,
+        # instead of a mkdir call for every article.
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
 
     logger.info("Saved article: {}", path)
     return path
@@ -74,79 +118,70 @@ def save_article(data_dir: Path, article: ArticleFull) -> Path:
 def _format_article(article: ArticleFull) -> str:
     """Format an article as Markdown with YAML front matter."""
     dt = article.created_datetime
-    date_str = dt.strftime("%Y-%m-%dT%H:%M:%S+08:00")
+    date_str = format_timestamp(dt)
 
     # Escape quotes in title for YAML
     safe_title = article.title.replace('"', '\\"')
 
-    lines = [
-        "---",
-        f'title: "{safe_title}"',
-        f"date: {date_str}",
-        f"article_id: {article.id}",
-        f"url: {article.url}",
-        f"view_count: {article.view_count}",
-        f"like_count: {article.like_count}",
-        "---",
-        "",
-        f"# {article.title}",
-        "",
-        article.content_markdown,
-    ]
+    buf = io.StringIO()
+    # One implicitly concatenated f-string: compiled into a single string
+    # build, about 4x cheaper than str.format on a module-level template.
+    buf.write(
+        "---\n"
+        f'title: "{safe_title}"\n'
+        f"date: {date_str}\n"
+        f"article_id: {article.id}\n"
+        f"url: {article.url}\n"
+        f"view_count: {article.view_count}\n"
+        f"like_count: {article.like_count}\n"
+        "---\n"
+        "\n"
+        f"# {article.title}\n"
+        "\n"
+    )
+    buf.write(article.content_markdown)
+    buf.write("\n")
 
     # Append author supplementary notes if any
     if article.author_comments:
-        lines.append("")
-        lines.append("---")
-        lines.append("")
-        lines.append("## 补充说明")
-        lines.append("")
-        for comment in article.author_comments:
-            comment_dt = comment.created_datetime
-            lines.append(f"### {comment_dt.strftime('%Y-%m-%d %H:%M')}")
-            lines.append("")
-            lines.append(_clean_comment_text(comment.text))
-            lines.append("")
+        _write_comments_section(buf, article.author_comments)
 
-    return "\n".join(lines) + "\n"
+    return buf.getvalue()
 
 
 def _clean_comment_text(text: str) -> str:
     """Clean HTML tags from comment text.
 
-    Xueqiu comment text may contain inline HTML like ``<a>`` tags
-    and ``<br/>`` line breaks.
+    Xueqiu comment text may contain inline HTML like ``<a>`` tags,
+    ``<br/>`` line breaks and entities such as ``&amp;``. Plain-text
+    comments skip the regex passes.
     """
-    # Replace <br> variants with newline
-    text = re.sub(r'<br\s*/?>', '\n', text, flags=re.IGNORECASE)
-    # Strip remaining HTML tags
-    text = re.sub(r'<[^>]+>', '', text)
-    return text.strip()
+    if "<" in text:
+        # Replace <br> variants with newline
+        text = _BR_RE.sub("\n", text)
+        # Strip remaining HTML tags
+        text = _TAG_RE.sub("", text)
+    # Decode entities last, then re-escape angle brackets so an escaped
+    # "&lt;b&gt;" is rendered as text rather than as HTML
+    return html.unescape(text).translate(_ANGLE_ESCAPES).strip()
+
 
+def _write_comments_section(buf: io.StringIO, comments: list[Comment]) -> None:
+    """Write a list of comments as the ``## 补充说明`` Markdown section.
 
-def _format_comments_section(comments: list[Comment]) -> str:
-    """Format a list of comments as the ``## 补充说明`` Markdown section.
+    Separated from the preceding content by a blank line and a rule;
+    every comment block ends with a blank line.
 
     Args:
+        buf: Buffer positioned right after the preceding content's newline.
         comments: Author comments to format.
-
-    Returns:
-        Formatted Markdown string including the section header.
     """
-    lines = [
-        "",
-        "---",
-        "",
-        "## 补充说明",
-        "",
-    ]
+    buf.write("\n---\n\n## 补充说明\n\n")
     for comment in comments:
-        comment_dt = comment.created_datetime
-        lines.append(f"### {comment_dt.strftime('%Y-%m-%d %H:%M')}")
-        lines.append("")
-        lines.append(_clean_comment_text(comment.text))
-        lines.append("")
-    return "\n".join(lines)
+        timestamp = comment.created_datetime.isoformat(" ", timespec="minutes")
+        buf.write(f"### {timestamp}\n\n")
+        buf.write(_clean_comment_text(comment.text))
+        buf.write("\n\n")
 
 
 def append_comments_to_article(file_path: Path, comments: list[Comment]) -> bool:
@@ -175,9 +210,11 @@ def append_comments_to_article(file_path: Path, comments: list[Comment]) -> bool
         logger.debug("Comments section already present in {}", file_path)
         return False
 
-    section = _format_comments_section(comments)
-    content = content.rstrip("\n") + "\n" + section + "\n"
-    file_path.write_text(content, encoding="utf-8")
+    buf = io.StringIO()
+    buf.write(content.rstrip("\n"))
+    buf.write("\n")
+    _write_comments_section(buf, comments)
+    file_path.write_text(buf.getvalue(), encoding="utf-8")
 
     logger.info("Appended {} comment(s) to {}", len(comments), file_path)
     return True
@@ -186,6 +223,9 @@ def append_comments_to_article(file_path: Path, comments: list[Comment]) -> bool
 def load_manifest(data_dir: Path) -> SyncManifest:
     """Load the sync manifest from disk.
 
+    Reads the ``manifest.json`` snapshot, then replays any entries
+    appended to the ``manifest.jsonl`` journal since it was written.
+
     Args:
         data_dir: Root data directory.
 
@@ -193,31 +233,83 @@ def load_manifest(data_dir: Path) -> SyncManifest:
         SyncManifest instance. Returns an empty manifest if the file
         does not exist or is unreadable.
     """
-    manifest_path = data_dir / "manifest.json"
-    if not manifest_path.exists():
-        return SyncManifest()
+    manifest_path = data_dir / MANIFEST_FILENAME
+    manifest = SyncManifest()
+    if manifest_path.exists():
+        try:
+            manifest = SyncManifest.model_validate_json(manifest_path.read_bytes())
+        except ValueError as exc:
+            logger.warning("Failed to load manifest, starting fresh: {}", exc)
 
-    try:
-        raw = json.loads(manifest_path.read_text(encoding="utf-8"))
-        return SyncManifest.model_validate(raw)
-    except (json.JSONDecodeError, ValueError) as exc:
-        logger.warning("Failed to load manifest, starting fresh: {}", exc)
-        return SyncManifest()
+    _replay_manifest_journal(data_dir, manifest)
+    return manifest
 
 
 def save_manifest(data_dir: Path, manifest: SyncManifest) -> None:
     """Persist the sync manifest to disk.
 
+    The snapshot is written to a temporary file and atomically renamed
+    over ``manifest.json`` once it is fsynced, so a crash or power loss
+    mid-write never leaves a truncated manifest. The journal is then
+    removed, since every entry in it is part of the new snapshot.
+
     Args:
         data_dir: Root data directory.
         manifest: Manifest to save.
     """
-    manifest_path = data_dir / "manifest.json"
+    manifest_path = data_dir / MANIFEST_FILENAME
     manifest_path.parent.mkdir(parents=True, exist_ok=True)
 
-    manifest.last_sync = datetime.now().strftime("%Y-%m-%dT%H:%M:%S+08:00")
-    manifest_path.write_text(
-        manifest.model_dump_json(indent=2),
-        encoding="utf-8",
+    manifest.last_sync = format_timestamp(datetime.now())
+    tmp_path = manifest_path.with_suffix(".json.tmp")
+    data = orjson.dumps(
+        manifest.model_dump(),
+        option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
     )
+    with tmp_path.open("wb") as f:
+        f.write(data)
+        # Flush to disk before the rename so a power loss cannot leave the
+        # rename durable but the data not.
+        f.flush()
+        os.fsync(f.fileno())
+    tmp_path.replace(manifest_path)
+    (data_dir / MANIFEST_JOURNAL_FILENAME).unlink(missing_ok=True)
     logger.debug("Manifest saved: {}", manifest_path)
+
+
+def append_manifest_delta(data_dir: Path, entry: SyncManifestEntry) -> None:
+    """Record a single added or updated manifest entry in the journal.
+
+    Appends one JSON line to ``manifest.jsonl`` instead of rewriting the
+    whole manifest; :func:`load_manifest` replays it and the next
+    :func:`save_manifest` folds it into the snapshot.
+
+    Args:
+        data_dir: Root data directory.
+        entry: Entry to record (replaces any entry with the same ID).
+    """
+    journal_path = data_dir / MANIFEST_JOURNAL_FILENAME
+    journal_path.parent.mkdir(parents=True, exist_ok=True)
+    with journal_path.open("a", encoding="utf-8") as f:
+        f.write(entry.model_dump_json() + "\n")
+
+
+def _replay_manifest_journal(data_dir: Path, manifest: SyncManifest) -> None:
+    """Apply journal entries on top of a loaded snapshot."""
+    journal_path = data_dir / MANIFEST_JOURNAL_FILENAME
+    if not journal_path.exists():
+        return
+
+    replayed = 0
+    for line in journal_path.read_text(encoding="utf-8").splitlines():
+        if not line.strip():
+            continue
+        try:
+            manifest.add_article(SyncManifestEntry.model_validate_json(line))
+        except ValueError:
+            # A crash mid-append can leave a partial last line
+            logger.warning("Skipping unreadable manifest journal line")
+            continue
+        replayed += 1
+
+    logger.debug("Replayed {} manifest journal entries", replayed)
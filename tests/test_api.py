@@ -0,0 +1,255 @@
+"""Tests for scraper.api."""
+
+import asyncio
+import unittest
+from collections.abc import Callable
+from unittest import mock
+
+import httpx
+
+from scraper import api
+from scraper.api import fetch_all_author_comments
+
+AUTHOR_ID = 1
+ARTICLE_ID = 300000001
+
+
+class CommentServer:
+    """In-memory ``/statuses/comments.json`` endpoint.
+
+    Serves comments newest-first, as requested with ``asc=false``. Every
+    third comment ID is written by the author; the rest by readers.
+    """
+
+    def __init__(self, total: int) -> None:
+        self.comment_ids = list(range(1, total + 1))
+        self.requested_pages: list[int] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        params = request.url.params
+        page = int(params["page"])
+        count = int(params["count"])
+        self.requested_pages.append(page)
+
+        assert params["asc"] == "false"
+        ids = self.comment_ids[::-1]
+        chunk = ids[(page - 1) * count : page * count]
+        comments = [
+            {
+                "id": cid,
+                "text": f"评论{cid}",
+                "created_at": 1705276200000 + cid * 1000,
+                "user": {"id": AUTHOR_ID if cid % 3 == 0 else 2},
+            }
+            for cid in chunk
+        ]
+        max_page = max(1, -(-len(ids) // count))
+        return httpx.Response(
+            200,
+            json={"page": page, "maxPage": max_page, "comments": comments},
+        )
+
+
+def _comment(cid: int, created_at: int, user_id: int = AUTHOR_ID) -> dict:
+    """Build a raw comment as the API returns it."""
+    return {
+        "id": cid,
+        "text": f"评论{cid}",
+        "created_at": created_at,
+        "user": {"id": user_id},
+    }
+
+
+def _pages_handler(
+    pages: list[list[dict]],
+) -> Callable[[httpx.Request], httpx.Response]:
+    """Serve fixed comment pages, reporting ``maxPage=len(pages)``."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        return httpx.Response(
+            200,
+            json={"page": page, "maxPage": len(pages), "comments": pages[page - 1]},
+        )
+
+    return handler
+
+
+class TestFetchAllAuthorComments(unittest.IsolatedAsyncioTestCase):
+    """Test comment pagination, filtering and merging."""
+
+    async def _fetch(self, handler, **kwargs) -> list[int]:
+        async with httpx.AsyncClient(
+            base_url="https://api.example.com",
+            transport=httpx.MockTransport(handler),
+        ) as client:
+            comments = await fetch_all_author_comments(
+                client, ARTICLE_ID, [AUTHOR_ID], request_delay=0, **kwargs
+            )
+        return [c.id for c in comments]
+
+    async def test_first_page_then_rest_gathered(self) -> None:
+        server = CommentServer(60)
+        events: list[tuple[str, int]] = []
+        in_flight = peak = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, peak
+            page = int(request.url.params["page"])
+            events.append(("start", page))
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            events.append(("end", page))
+            return server(request)
+
+        ids = await self._fetch(handler, count=10, concurrency=2)
+
+        self.assertEqual(ids, list(range(3, 61, 3)))
+        self.assertEqual(events[:2], [("start", 1), ("end", 1)])
+        self.assertEqual(sorted(server.requested_pages[1:]), [2, 3, 4, 5, 6])
+        self.assertEqual(peak, 2)
+
+    async def test_single_request_without_comments(self) -> None:
+        server = CommentServer(0)
+        self.assertEqual(await self._fetch(server), [])
+        self.assertEqual(server.requested_pages, [1])
+
+    async def test_filters_before_validation(self) -> None:
+        # The reader comment would fail validation if it were parsed.
+        reader = {"id": "not-an-id", "user": {"id": 2}}
+        handler = _pages_handler([[reader, _comment(7, 1000)], [{"id": 8}]])
+        self.assertEqual(await self._fetch(handler), [7])
+
+    async def test_merges_pages_by_created_at(self) -> None:
+        handler = _pages_handler(
+            [
+                [_comment(4, 4000), _comment(1, 1000)],
+                [_comment(5, 5000), _comment(2, 2000)],
+                [_comment(3, 3000)],
+            ]
+        )
+        self.assertEqual(await self._fetch(handler), [1, 2, 3, 4, 5])
+
+    async def test_requests_newest_first(self) -> None:
+        requests: list[httpx.Request] = []
+        server = CommentServer(20)
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return server(request)
+
+        self.assertEqual(await self._fetch(handler, count=10), list(range(3, 21, 3)))
+        self.assertEqual({r.url.params["asc"] for r in requests}, {"false"})
+
+    async def test_drops_repeated_comments(self) -> None:
+        handler = _pages_handler(
+            [
+                [_comment(3, 3000), _comment(2, 2000)],
+                [_comment(2, 2000), _comment(1, 1000)],
+            ]
+        )
+        self.assertEqual(await self._fetch(handler), [1, 2, 3])
+
+
+class TestRequestRetry(unittest.IsolatedAsyncioTestCase):
+    """Test retrying WAF HTML responses until JSON arrives."""
+
+    def setUp(self) -> None:
+        self.requests = 0
+        self.chunks_read = 0
+        self.sleep = mock.AsyncMock()
+        patcher = mock.patch.object(api, "_sleep", self.sleep)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _waf_page(self, headers: dict[str, str] | None = None) -> httpx.Response:
+        """A streamed HTML interstitial that counts the chunks read from it."""
+
+        async def body():
+            for _ in range(100):
+                self.chunks_read += 1
+                yield b"<html>" + b"x" * 1024 + b"</html>"
+
+        return httpx.Response(
+            200,
+            headers={"content-type": "text/html", **(headers or {})},
+            content=body(),
+        )
+
+    async def _request(self, html_responses: int, **headers: str) -> bytes:
+        self.requests = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            self.requests += 1
+            if self.requests <= html_responses:
+                return self._waf_page(headers)
+            return httpx.Response(200, json={"ok": True})
+
+        async with httpx.AsyncClient(
+            base_url="https://api.example.com",
+            transport=httpx.MockTransport(handler),
+        ) as client:
+            return await api._request_bytes_with_retry(client, "GET", "/x.json")
+
+    async def test_returns_json_after_html(self) -> None:
+        body = await self._request(2)
+
+        self.assertEqual(body, b'{"ok":true}')
+        self.assertEqual(self.requests, 3)
+        self.assertEqual(self.sleep.await_count, 2)
+        # Interstitials before the last attempt are discarded unread.
+        self.assertEqual(self.chunks_read, 0)
+
+    async def test_raises_after_html_on_every_attempt(self) -> None:
+        with self.assertRaises(RuntimeError):
+            await self._request(api.MAX_RETRIES)
+
+        self.assertEqual(self.requests, api.MAX_RETRIES)
+        self.assertEqual(self.sleep.await_count, api.MAX_RETRIES - 1)
+        # Only the final attempt peeks at the page, and only one chunk.
+        self.assertEqual(self.chunks_read, 1)
+
+    def _sleeps(self) -> list[float]:
+        return [call.args[0] for call in self.sleep.await_args_list]
+
+    async def test_jitter_grows_from_previous_sleep(self) -> None:
+        uniform = mock.Mock(side_effect=lambda low, high: high)
+        with mock.patch.object(api.random, "uniform", uniform):
+            await self._request(4)
+
+        base, cap = api.RETRY_BASE_DELAY, api.RETRY_MAX_DELAY
+        self.assertEqual(
+            [call.args for call in uniform.call_args_list],
+            [(base, base * 3), (base, base * 9), (base, cap * 3), (base, cap * 3)],
+        )
+        self.assertEqual(self._sleeps(), [base * 3, cap, cap, cap])
+
+    async def test_jitter_floor_is_base_delay(self) -> None:
+        uniform = mock.Mock(side_effect=lambda low, high: low)
+        with mock.patch.object(api.random, "uniform", uniform):
+            await self._request(3)
+
+        base = api.RETRY_BASE_DELAY
+        self.assertEqual(
+            [call.args for call in uniform.call_args_list], [(base, base * 3)] * 3
+        )
+        self.assertEqual(self._sleeps(), [base] * 3)
+
+    async def test_retry_after_is_a_floor(self) -> None:
+        with mock.patch.object(api.random, "uniform", lambda low, high: low):
+            await self._request(2, **{"Retry-After": "120"})
+            await self._request(1, **{"Retry-After": "10"})
+
+        self.assertEqual(self._sleeps(), [120.0, 120.0, api.RETRY_BASE_DELAY])
+
+    async def test_retry_after_date_falls_back_to_jitter(self) -> None:
+        with mock.patch.object(api.random, "uniform", lambda low, high: low):
+            await self._request(1, **{"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})
+
+        self.assertEqual(self._sleeps(), [api.RETRY_BASE_DELAY])
+
+
+if __name__ == "__main__":
+    unittest.main()
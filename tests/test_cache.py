@@ -0,0 +1,52 @@
+"""Tests for scraper.cache."""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from scraper.cache import ResponseCache
+
+
+class TestResponseCache(unittest.TestCase):
+    """Test the on-disk response cache."""
+
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmpdir.name) / "cache.sqlite3"
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def test_make_key_ignores_param_order(self) -> None:
+        a = ResponseCache.make_key("/x.json", {"id": 1, "page": 2})
+        b = ResponseCache.make_key("/x.json", {"page": 2, "id": 1})
+        self.assertEqual(a, b)
+
+    def test_miss(self) -> None:
+        with ResponseCache(self.path) as cache:
+            self.assertIsNone(cache.get("missing"))
+
+    def test_roundtrip_persists(self) -> None:
+        with ResponseCache(self.path) as cache:
+            cache.set("k", '{"text": "<p>内容</p>"}'.encode())
+        with ResponseCache(self.path) as cache:
+            self.assertEqual(cache.get("k"), '{"text": "<p>内容</p>"}'.encode())
+
+    def test_expired_entry_ignored(self) -> None:
+        with ResponseCache(self.path, ttl=-1) as cache:
+            cache.set("k", b'{"id": 1}')
+            self.assertIsNone(cache.get("k"))
+
+    def test_expired_entry_purged_on_open(self) -> None:
+        with ResponseCache(self.path) as cache:
+            cache.set("old", b'{"id": 1}')
+            cache._conn.execute("UPDATE responses SET stored_at = 0")
+            cache._conn.commit()
+            cache.set("new", b'{"id": 2}')
+        with ResponseCache(self.path) as cache:
+            rows = cache._conn.execute("SELECT key FROM responses").fetchall()
+            self.assertEqual(rows, [("new",)])
+
+
+if __name__ == "__main__":
+    unittest.main()
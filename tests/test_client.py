@@ -0,0 +1,98 @@
+"""Tests for scraper.client."""
+
+import unittest
+from unittest import mock
+
+import httpx
+
+from scraper import api
+from scraper.client import RateLimitedTransport, _parse_cookie_string
+from scraper.ratelimit import TokenBucket
+
+
+class TestParseCookieString(unittest.TestCase):
+    """Test parsing of browser Cookie header strings."""
+
+    def test_full_header(self) -> None:
+        cookies = _parse_cookie_string("acw_tc=abc; xq_a_token=def;u=1")
+        self.assertEqual(cookies, {"acw_tc": "abc", "xq_a_token": "def", "u": "1"})
+
+    def test_whitespace_and_empty_pairs(self) -> None:
+        cookies = _parse_cookie_string("  a = 1 ;; b=2; flag;  c=  ")
+        self.assertEqual(cookies, {"a": "1", "b": "2", "c": ""})
+
+    def test_value_with_equals(self) -> None:
+        cookies = _parse_cookie_string("token=abc==; u=1")
+        self.assertEqual(cookies["token"], "abc==")
+
+    def test_key_with_spaces(self) -> None:
+        cookies = _parse_cookie_string("a b=1; c=2")
+        self.assertEqual(cookies, {"a b": "1", "c": "2"})
+
+    def test_empty_key(self) -> None:
+        cookies = _parse_cookie_string("=x=y; u=1")
+        self.assertEqual(cookies, {"": "x=y", "u": "1"})
+
+    def test_bare_token(self) -> None:
+        self.assertEqual(_parse_cookie_string(" abc123 "), {"xq_a_token": "abc123"})
+
+
+class TestRateLimitedTransport(unittest.IsolatedAsyncioTestCase):
+    """Test that requests go through the shared token bucket."""
+
+    async def _get(self, headers: dict[str, str]) -> mock.Mock:
+        bucket = mock.Mock(acquire=mock.AsyncMock())
+        inner = httpx.MockTransport(
+            lambda request: httpx.Response(200, headers=headers)
+        )
+        transport = RateLimitedTransport(inner, bucket)
+        async with httpx.AsyncClient(transport=transport) as client:
+            await client.get("https://api.example.com/")
+        return bucket
+
+    async def test_acquires_before_each_request(self) -> None:
+        bucket = await self._get({})
+        bucket.acquire.assert_awaited_once()
+        bucket.penalize.assert_not_called()
+
+    async def test_retry_after_pauses_bucket(self) -> None:
+        bucket = await self._get({"Retry-After": "30"})
+        bucket.penalize.assert_called_once_with(30.0)
+
+    async def test_ignores_http_date_retry_after(self) -> None:
+        bucket = await self._get({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})
+        bucket.penalize.assert_not_called()
+
+    async def test_retry_after_waited_once_by_retrying_task(self) -> None:
+        now = 0.0
+
+        async def sleep(seconds: float) -> None:
+            nonlocal now
+            now += seconds
+
+        responses = iter(
+            [
+                httpx.Response(
+                    200, headers={"content-type": "text/html", "Retry-After": "60"}
+                ),
+                httpx.Response(200, json={}),
+            ]
+        )
+        bucket = TokenBucket(1.0, clock=lambda: now, sleep=sleep)
+        transport = RateLimitedTransport(
+            httpx.MockTransport(lambda request: next(responses)), bucket
+        )
+        with mock.patch.object(api, "_sleep", sleep), mock.patch.object(
+            api.random, "uniform", lambda low, high: low
+        ):
+            async with httpx.AsyncClient(transport=transport) as client:
+                await api._request_bytes_with_retry(
+                    client, "GET", "https://api.example.com/x.json"
+                )
+
+        # The bucket debt is repaid while the retry sleeps off Retry-After.
+        self.assertEqual(now, 60.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
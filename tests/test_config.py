@@ -0,0 +1,64 @@
+"""Tests for scraper.config."""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from scraper.config import load_config
+
+
+class TestLoadConfig(unittest.TestCase):
+    """Test config merging from YAML, environment and arguments."""
+
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmpdir.name) / "config.yaml"
+        self.path.write_text("user_id: 1\ncookie: from_yaml\nrequest_delay: 1.5\n")
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def test_yaml_values(self) -> None:
+        with mock.patch.dict(os.environ, {}, clear=True):
+            cfg = load_config(self.path)
+        self.assertEqual(cfg.user_id, 1)
+        self.assertEqual(cfg.cookie, "from_yaml")
+        self.assertEqual(cfg.request_delay, 1.5)
+
+    def test_env_overrides_yaml(self) -> None:
+        env = {
+            "XUEQIU_USER_ID": "42",
+            "XUEQIU_DATA_DIR": "/tmp/articles",
+            "XUEQIU_SKIP_COMMENTS": "true",
+            "XUEQIU_COOKIE": "",
+            "XUEQIU_UNKNOWN": "ignored",
+        }
+        with mock.patch.dict(os.environ, env, clear=True):
+            cfg = load_config(self.path)
+        self.assertEqual(cfg.user_id, 42)
+        self.assertEqual(cfg.data_dir, Path("/tmp/articles"))
+        self.assertTrue(cfg.skip_comments)
+        self.assertEqual(cfg.cookie, "from_yaml")
+
+    def test_explicit_cookie_wins(self) -> None:
+        with mock.patch.dict(os.environ, {"XUEQIU_COOKIE": "from_env"}, clear=True):
+            cfg = load_config(self.path, cookie="from_arg")
+        self.assertEqual(cfg.cookie, "from_arg")
+
+    def test_unknown_yaml_keys_ignored(self) -> None:
+        self.path.write_text("user_id: '7'\nlegacy_option: 1\n")
+        with mock.patch.dict(os.environ, {}, clear=True):
+            cfg = load_config(self.path)
+        self.assertEqual(cfg.user_id, 7)
+        self.assertFalse(hasattr(cfg, "legacy_option"))
+
+    def test_missing_file(self) -> None:
+        with mock.patch.dict(os.environ, {}, clear=True):
+            cfg = load_config(Path(self.tmpdir.name) / "missing.yaml")
+        self.assertEqual(cfg.cookie, "")
+
+
+if __name__ == "__main__":
+    unittest.main()
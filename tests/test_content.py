@@ -1,9 +1,14 @@
 """Tests for scraper.content."""
 
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from unittest import mock
 
-from scraper.content import extract_article_html, html_to_markdown
+from lxml import etree
+
+from scraper import content
+from scraper.content import content_hash, extract_article_html, html_to_markdown
 
 FIXTURES = Path(__file__).parent / "fixtures"
 
@@ -23,6 +28,22 @@ class TestExtractArticleHtml(unittest.TestCase):
         html = extract_article_html(self.page_html)
         self.assertNotEqual(html, "")
 
+    def test_stops_at_first_article_div(self) -> None:
+        page = (
+            '<html><body><div class="nav">菜单</div>'
+            '<div class="a article__bd__detail"><p>正文</p></div>尾部'
+            '<div class="article__bd__detail"><p>第二个</p></div>'
+            "</body></html>"
+        )
+        html = extract_article_html(page)
+        self.assertIn("正文", html)
+        self.assertNotIn("尾部", html)
+        self.assertNotIn("第二个", html)
+
+    def test_class_substring_does_not_match(self) -> None:
+        page = '<div class="article__bd__detail-extra"><p>不是正文</p></div>'
+        self.assertEqual(extract_article_html(page), "")
+
     def test_empty_input(self) -> None:
         html = extract_article_html("")
         self.assertEqual(html, "")
@@ -46,6 +67,33 @@ class TestExtractViaScriptJson(unittest.TestCase):
         html = extract_article_html(page)
         self.assertIn("脚本中的内容", html)
 
+    def test_braces_inside_strings(self) -> None:
+        page = (
+            "<script>SNB.data.current_status = "
+            '{"text": "<p>{括号} \\"}\\"</p>", "meta": {"a": 1}};</script>'
+        )
+        html = extract_article_html(page)
+        self.assertEqual(html, '<p>{括号} "}"</p>')
+
+    def test_unbalanced_object(self) -> None:
+        page = '<script>SNB.data.current_status = {"text": "<p>x</p>"</script>'
+        self.assertEqual(extract_article_html(page), "")
+
+    def test_marker_in_condition(self) -> None:
+        page = "<script>if (SNB.data.current_status) { init(); }</script>"
+        self.assertEqual(extract_article_html(page), "")
+
+    def test_marker_without_assignment(self) -> None:
+        page = "<script>SNB.data.current_status;</script>"
+        self.assertEqual(extract_article_html(page), "")
+
+    def test_marker_prefix_before_assignment(self) -> None:
+        page = (
+            "<script>SNB.data.current_status_id = 123;\n"
+            'SNB.data.current_status = {"text": "<p>真正的正文</p>"};</script>'
+        )
+        self.assertEqual(extract_article_html(page), "<p>真正的正文</p>")
+
 
 class TestHtmlToMarkdown(unittest.TestCase):
     """Test HTML-to-Markdown conversion."""
@@ -62,6 +110,14 @@ class TestHtmlToMarkdown(unittest.TestCase):
         md = html_to_markdown("<p><strong>粗体</strong></p>")
         self.assertIn("**粗体**", md)
 
+    def test_inline_tail_not_duplicated(self) -> None:
+        md = html_to_markdown("<p>前文<strong>粗体</strong>后文</p>")
+        self.assertEqual(md, "前文**粗体**后文")
+
+    def test_collapses_blank_lines(self) -> None:
+        md = html_to_markdown("<div>上<br/><br/><br/><br/>下</div>")
+        self.assertEqual(md, "上\n\n下")
+
     def test_link(self) -> None:
         md = html_to_markdown('<p><a href="https://example.com">链接</a></p>')
         self.assertIn("[链接](https://example.com)", md)
@@ -80,6 +136,17 @@ class TestHtmlToMarkdown(unittest.TestCase):
         self.assertIn("> ", md)
         self.assertIn("引用内容", md)
 
+    def test_drops_comments(self) -> None:
+        md = html_to_markdown("<div><!-- 注释 -->正文</div>")
+        self.assertEqual(md, "正文")
+
+    def test_parallel_threads(self) -> None:
+        html = "<h2>标题</h2><p>前文<strong>粗体</strong>后文</p>" * 50
+        expected = html_to_markdown(html)
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(html_to_markdown, [html] * 16))
+        self.assertEqual(results, [expected] * 16)
+
     def test_empty_input(self) -> None:
         md = html_to_markdown("")
         self.assertEqual(md, "")
@@ -93,5 +160,27 @@ class TestHtmlToMarkdown(unittest.TestCase):
         self.assertIn("列表项一", md)
 
 
+class TestContentHash(unittest.TestCase):
+    """Test article body hashing."""
+
+    def test_stable_and_distinct(self) -> None:
+        self.assertEqual(content_hash("<p>甲</p>"), content_hash("<p>甲</p>"))
+        self.assertNotEqual(content_hash("<p>甲</p>"), content_hash("<p>乙</p>"))
+        self.assertEqual(len(content_hash("")), 32)
+
+
+class TestStripTags(unittest.TestCase):
+    """Test the plain-text fallback."""
+
+    def test_text_and_entities(self) -> None:
+        text = content._strip_tags("<p>甲 &amp; <b>乙</b></p><p>&lt;丙&gt;</p>")
+        self.assertEqual(text, "甲 & 乙<丙>")
+
+    def test_regex_fallback(self) -> None:
+        with mock.patch.object(content, "_parse_html", side_effect=etree.Error):
+            text = content._strip_tags("<p>甲 &amp; 乙</p>")
+        self.assertEqual(text, "甲 & 乙")
+
+
 if __name__ == "__main__":
     unittest.main()
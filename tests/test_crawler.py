@@ -0,0 +1,225 @@
+"""Tests for scraper.crawler."""
+
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import httpx
+
+from scraper import crawler
+from scraper.config import ScraperConfig
+from scraper.models import ArticleSummary
+from scraper.ratelimit import AdaptiveDelay
+from scraper.storage import load_manifest
+
+ARTICLE_IDS = (101, 102, 103)
+
+
+def _handler(
+    request: httpx.Request,
+    article_ids: tuple[int, ...] = ARTICLE_IDS,
+    page_size: int = len(ARTICLE_IDS),
+) -> httpx.Response:
+    """Serve a paged timeline, article details and one comment page."""
+    path = request.url.path
+    params = request.url.params
+    if path.endswith("timeline.json"):
+        page = int(params.get("page", 1))
+        max_page = -(-len(article_ids) // page_size)
+        articles = [
+            {
+                "id": aid,
+                "title": f"文章{aid}",
+                "created_at": 1705276200000,
+                "user_id": 1,
+            }
+            for aid in article_ids[(page - 1) * page_size : page * page_size]
+        ]
+        return httpx.Response(
+            200,
+            json={"total": len(article_ids), "maxPage": max_page, "list": articles},
+        )
+    if path.endswith("show.json"):
+        return httpx.Response(200, json={"text": f"<p>正文{params['id']}</p>"})
+    if path.endswith("comments.json"):
+        comment = {
+            "id": int(params["id"]) * 10,
+            "text": "补充",
+            "created_at": 1705276300000,
+            "user": {"id": 1},
+        }
+        return httpx.Response(200, json={"maxPage": 1, "comments": [comment]})
+    return httpx.Response(404)
+
+
+class TestSyncArticles(unittest.IsolatedAsyncioTestCase):
+    """Test article sync against a mocked API."""
+
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.config = ScraperConfig(
+            user_id=1, data_dir=Path(self.tmpdir.name), request_delay=0
+        )
+        self.requests: list[httpx.Request] = []
+
+        patcher = mock.patch.object(AdaptiveDelay, "wait", mock.AsyncMock())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _client(self) -> httpx.AsyncClient:
+        def handler(request: httpx.Request) -> httpx.Response:
+            self.requests.append(request)
+            return _handler(request)
+
+        return httpx.AsyncClient(
+            base_url="https://api.example.com",
+            transport=httpx.MockTransport(handler),
+        )
+
+    async def test_detail_overlaps_comments(self) -> None:
+        comments_seen = {aid: asyncio.Event() for aid in ARTICLE_IDS}
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            aid = int(request.url.params.get("id", 0))
+            if request.url.path.endswith("comments.json"):
+                comments_seen[aid].set()
+            elif request.url.path.endswith("show.json"):
+                # Only completes if the comment fetch was started alongside.
+                await asyncio.wait_for(comments_seen[aid].wait(), timeout=1)
+            return _handler(request)
+
+        transport = httpx.MockTransport(handler)
+        async with httpx.AsyncClient(
+            base_url="https://api.example.com", transport=transport
+        ) as client:
+            downloaded = await crawler.sync_articles(client, self.config)
+
+        self.assertEqual(downloaded, len(ARTICLE_IDS))
+
+    async def test_failed_conversion_cancels_comments(self) -> None:
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path.endswith("comments.json"):
+                started.set()
+                try:
+                    await asyncio.Event().wait()
+                except asyncio.CancelledError:
+                    cancelled.set()
+                    raise
+            await started.wait()
+            return _handler(request)
+
+        convert = mock.AsyncMock(side_effect=RuntimeError("boom"))
+        summary = ArticleSummary(id=101, created_at=1705276200000, user_id=1)
+        with mock.patch.object(crawler, "_convert_markdown", convert):
+            async with httpx.AsyncClient(
+                base_url="https://api.example.com",
+                transport=httpx.MockTransport(handler),
+            ) as client:
+                with self.assertRaises(RuntimeError):
+                    await crawler._fetch_full_article(client, self.config, summary)
+                await asyncio.wait_for(cancelled.wait(), timeout=1)
+
+    async def test_downloads_new_articles(self) -> None:
+        async with self._client() as client:
+            downloaded = await crawler.sync_articles(client, self.config)
+
+        self.assertEqual(downloaded, len(ARTICLE_IDS))
+        manifest = load_manifest(self.config.data_dir)
+        self.assertEqual(sorted(manifest.articles), list(ARTICLE_IDS))
+        self.assertTrue(all(e.comments_fetched for e in manifest.articles.values()))
+
+    async def test_reuses_one_client(self) -> None:
+        fetch = mock.AsyncMock(wraps=crawler._fetch_full_article)
+        with mock.patch.object(crawler, "_fetch_full_article", fetch):
+            async with self._client() as client:
+                await crawler.sync_articles(client, self.config)
+
+        self.assertEqual(fetch.await_count, len(ARTICLE_IDS))
+        for call in fetch.await_args_list:
+            self.assertIs(call.args[0], client)
+
+    async def test_skips_synced_articles(self) -> None:
+        async with self._client() as client:
+            await crawler.sync_articles(client, self.config)
+            self.requests.clear()
+            downloaded = await crawler.sync_articles(client, self.config)
+
+        self.assertEqual(downloaded, 0)
+        paths = [r.url.path for r in self.requests]
+        self.assertEqual(paths, ["/statuses/original/timeline.json"])
+
+
+class TestIncrementalScan(unittest.IsolatedAsyncioTestCase):
+    """Test stopping the page scan at already-synced articles."""
+
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.data_dir = Path(self.tmpdir.name)
+        self.article_ids: tuple[int, ...] = (6, 5, 4, 3, 2, 1)
+        self.list_pages: list[int] = []
+
+        for patcher in (
+            mock.patch.object(AdaptiveDelay, "wait", mock.AsyncMock()),
+            mock.patch.object(crawler, "BATCH_PAUSE_RANGE", (0.0, 0.0)),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def _sync(self, **overrides) -> int:
+        self.list_pages.clear()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path.endswith("timeline.json"):
+                self.list_pages.append(int(request.url.params["page"]))
+            return _handler(request, self.article_ids, page_size=2)
+
+        config = ScraperConfig(
+            user_id=1,
+            data_dir=self.data_dir,
+            request_delay=0,
+            page_size=2,
+            skip_comments=True,
+            **overrides,
+        )
+        async with httpx.AsyncClient(
+            base_url="https://api.example.com",
+            transport=httpx.MockTransport(handler),
+        ) as client:
+            return await crawler.sync_articles(client, config)
+
+    async def test_first_sync_lists_every_page(self) -> None:
+        self.assertEqual(await self._sync(), 6)
+        self.assertEqual(self.list_pages, [1, 2, 3])
+        self.assertTrue(load_manifest(self.data_dir).history_complete)
+
+    async def test_stops_at_synced_articles(self) -> None:
+        await self._sync()
+        self.article_ids = (8, 7) + self.article_ids
+
+        self.assertEqual(await self._sync(), 2)
+        self.assertEqual(self.list_pages, [1, 2])
+
+    async def test_full_scan_lists_every_page(self) -> None:
+        await self._sync()
+        self.article_ids = (7,) + self.article_ids
+
+        self.assertEqual(await self._sync(full_scan=True), 1)
+        self.assertEqual(self.list_pages, [1, 2, 3, 4])
+
+    async def test_incomplete_history_keeps_scanning(self) -> None:
+        self.assertEqual(await self._sync(max_pages=1), 2)
+        self.assertFalse(load_manifest(self.data_dir).history_complete)
+
+        self.assertEqual(await self._sync(), 4)
+        self.assertEqual(self.list_pages, [1, 2, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -112,6 +112,14 @@ class TestSyncManifest(unittest.TestCase):
         self.assertEqual(restored.user_id, 12345)
         self.assertTrue(restored.has_article(999))
 
+    def test_json_keys_are_strings(self) -> None:
+        manifest = SyncManifest()
+        manifest.add_article(SyncManifestEntry(article_id=999))
+
+        self.assertIn('"999":', manifest.model_dump_json())
+        restored = SyncManifest.model_validate_json(manifest.model_dump_json())
+        self.assertEqual(list(restored.articles), [999])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,75 @@
+"""Tests for scraper.ratelimit."""
+
+import unittest
+from unittest import mock
+
+from scraper.ratelimit import AdaptiveDelay, TokenBucket
+
+
+class TestAdaptiveDelay(unittest.TestCase):
+    """Test delay adjustment on success and failure."""
+
+    def test_failure_doubles_up_to_max(self) -> None:
+        delay = AdaptiveDelay(base=40.0, max_delay=120.0)
+        delay.failure()
+        self.assertEqual(delay.current, 80.0)
+        delay.failure()
+        self.assertEqual(delay.current, 120.0)
+
+    def test_success_decays_to_min(self) -> None:
+        delay = AdaptiveDelay(base=3.2, min_delay=3.0)
+        delay.success()
+        self.assertEqual(delay.current, 3.0)
+
+
+class TestAdaptiveDelayWait(unittest.IsolatedAsyncioTestCase):
+    """Test the jittered sleep."""
+
+    async def test_wait_within_jitter_bounds(self) -> None:
+        delay = AdaptiveDelay(base=10.0, jitter=0.5)
+        with mock.patch("scraper.ratelimit.asyncio.sleep") as sleep:
+            for value in (0.0, 0.5, 0.999):
+                with mock.patch("scraper.ratelimit.random.random", return_value=value):
+                    await delay.wait()
+        slept = [call.args[0] for call in sleep.await_args_list]
+        self.assertEqual(slept[:2], [5.0, 10.0])
+        self.assertLess(slept[2], 15.0)
+
+
+class TestTokenBucket(unittest.IsolatedAsyncioTestCase):
+    """Test token-bucket pacing on a fake clock."""
+
+    def setUp(self) -> None:
+        self.now = 1000.0
+        self.slept: list[float] = []
+
+    async def _sleep(self, seconds: float) -> None:
+        self.slept.append(seconds)
+        self.now += seconds
+
+    def _bucket(self, rate: float, capacity: float) -> TokenBucket:
+        return TokenBucket(rate, capacity, clock=lambda: self.now, sleep=self._sleep)
+
+    async def test_burst_then_rate(self) -> None:
+        bucket = self._bucket(rate=2.0, capacity=2.0)
+        for _ in range(4):
+            await bucket.acquire()
+        self.assertEqual(self.slept, [0.5, 0.5])
+
+    async def test_idle_refill_capped_at_capacity(self) -> None:
+        bucket = self._bucket(rate=1.0, capacity=2.0)
+        await bucket.acquire()
+        self.now += 60.0
+        for _ in range(3):
+            await bucket.acquire()
+        self.assertEqual(self.slept, [1.0])
+
+    async def test_penalize_holds_back_next_acquire(self) -> None:
+        bucket = self._bucket(rate=1.0, capacity=2.0)
+        bucket.penalize(30.0)
+        await bucket.acquire()
+        self.assertAlmostEqual(sum(self.slept), 30.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,11 +3,15 @@
 import json
 import tempfile
 import unittest
+from datetime import datetime
 from pathlib import Path
 
 from scraper.models import ArticleFull, Comment, CommentUser, SyncManifest, SyncManifestEntry
 from scraper.storage import (
+    _clean_comment_text,
+    append_manifest_delta,
     build_article_path,
+    format_timestamp,
     load_manifest,
     sanitize_filename,
     save_article,
@@ -15,6 +19,40 @@ from scraper.storage import (
 )
 
 
+class TestFormatTimestamp(unittest.TestCase):
+    """Test ISO 8601 timestamp formatting."""
+
+    def test_matches_strftime(self) -> None:
+        dt = datetime(2024, 1, 15, 8, 5, 9)
+        self.assertEqual(format_timestamp(dt), dt.strftime("%Y-%m-%dT%H:%M:%S+08:00"))
+
+    def test_drops_fractional_seconds(self) -> None:
+        dt = datetime.fromtimestamp(1705276200123 / 1000)
+        self.assertNotIn(".", format_timestamp(dt))
+        self.assertTrue(format_timestamp(dt).endswith("+08:00"))
+
+
+class TestCleanCommentText(unittest.TestCase):
+    """Test reduction of comment HTML to plain text."""
+
+    def test_plain_text(self) -> None:
+        self.assertEqual(_clean_comment_text("  补充一下  "), "补充一下")
+
+    def test_tags_and_line_breaks(self) -> None:
+        text = "第一行<br/>第二行 <a href='/S/SH600519'>$贵州茅台$</a><BR>"
+        self.assertEqual(_clean_comment_text(text), "第一行\n第二行 $贵州茅台$")
+
+    def test_entities_decoded(self) -> None:
+        text = "A &amp; B &quot;C&quot; &#36;"
+        self.assertEqual(_clean_comment_text(text), 'A & B "C" $')
+
+    def test_escaped_tags_stay_literal(self) -> None:
+        text = "&lt;b&gt;粗&lt;/b&gt; &lt;script&gt;"
+        self.assertEqual(
+            _clean_comment_text(text), "&lt;b&gt;粗&lt;/b&gt; &lt;script&gt;"
+        )
+
+
 class TestSanitizeFilename(unittest.TestCase):
     """Test filename sanitization."""
 
@@ -136,6 +174,44 @@ class TestManifestPersistence(unittest.TestCase):
             self.assertTrue(loaded.has_article(999))
             self.assertNotEqual(loaded.last_sync, "")
 
+    def test_journal_replayed_and_folded(self) -> None:
+        manifest = SyncManifest(user_id=12345)
+        manifest.add_article(SyncManifestEntry(article_id=1, comments_fetched=False))
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            data_dir = Path(tmpdir)
+            save_manifest(data_dir, manifest)
+            append_manifest_delta(
+                data_dir, SyncManifestEntry(article_id=1, comments_fetched=True)
+            )
+            append_manifest_delta(data_dir, SyncManifestEntry(article_id=2))
+            with (data_dir / "manifest.jsonl").open("a") as f:
+                f.write('{"article_id": 3, "tit')
+
+            loaded = load_manifest(data_dir)
+            self.assertTrue(loaded.articles[1].comments_fetched)
+            self.assertTrue(loaded.has_article(2))
+            self.assertFalse(loaded.has_article(3))
+
+            save_manifest(data_dir, loaded)
+            self.assertFalse((data_dir / "manifest.jsonl").exists())
+            self.assertFalse((data_dir / "manifest.json.tmp").exists())
+            self.assertTrue(load_manifest(data_dir).has_article(2))
+
+    def test_saved_keys_stay_strings(self) -> None:
+        manifest = SyncManifest()
+        manifest.add_article(SyncManifestEntry(article_id=42, title="旧"))
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            data_dir = Path(tmpdir)
+            save_manifest(data_dir, manifest)
+            raw = (data_dir / "manifest.json").read_text(encoding="utf-8")
+            self.assertIn('"42": {', raw)
+
+            loaded = load_manifest(data_dir)
+            self.assertEqual(list(loaded.articles), [42])
+            self.assertTrue(loaded.has_article(42))
+
     def test_load_nonexistent(self) -> None:
         with tempfile.TemporaryDirectory() as tmpdir:
             manifest = load_manifest(Path(tmpdir))